@@ -5,6 +5,8 @@ Moduł algorytmów dla problemu komiwojażera (TSP).
 Zawiera implementacje:
 - NN  - Nearest Neighbor (najbliższy sąsiad)
 - IHC - Iterative Hill Climbing (wspinaczka z multistartem)
+- VND - Variable Neighborhood Descent (polerowanie minimum lokalnego)
+- ILS - Iterated Local Search (perturbacja double-bridge + 2-opt)
 - SA  - Simulated Annealing (symulowane wyżarzanie)
 - TS  - Tabu Search (przeszukiwanie tabu)
 - GA  - Genetic Algorithm (algorytm genetyczny)
@@ -12,23 +14,32 @@ Zawiera implementacje:
 """
 
 from algorithms.nn import nearest_neighbor
+from algorithms.vnd import variable_neighborhood_descent
 from algorithms.ihc import iterative_hill_climbing, ihc_with_intensification
-from algorithms.sa import simulated_annealing, sa_with_reheating
-from algorithms.ts import tabu_search, tabu_search_diversification
-from algorithms.ga import genetic_algorithm, ga_adaptive_mutation
-from algorithms.aco import ant_colony_optimization, max_min_ant_system, aco_with_local_search
+from algorithms.ils import iterated_local_search
+from algorithms.sa import simulated_annealing, sa_with_reheating, parallel_tempering
+from algorithms.ts import tabu_search, tabu_search_diversification, tabu_search_best_improvement
+from algorithms.ga import genetic_algorithm, ga_adaptive_mutation, island_genetic_algorithm, steady_state_ga
+from algorithms.aco import ant_colony_optimization, max_min_ant_system, aco_with_local_search, ant_colony_system
 
 __all__ = [
     'nearest_neighbor',
     'iterative_hill_climbing',
     'ihc_with_intensification',
+    'variable_neighborhood_descent',
+    'iterated_local_search',
     'simulated_annealing',
     'sa_with_reheating',
+    'parallel_tempering',
     'tabu_search',
     'tabu_search_diversification',
+    'tabu_search_best_improvement',
     'genetic_algorithm',
     'ga_adaptive_mutation',
+    'island_genetic_algorithm',
+    'steady_state_ga',
     'ant_colony_optimization',
     'max_min_ant_system',
     'aco_with_local_search',
+    'ant_colony_system',
 ]
@@ -15,9 +15,31 @@ Parametry:
 - beta: wpływ heurystyki (odległości) na wybór ścieżki
 - rho: współczynnik parowania feromonów (evaporation rate)
 - q: stała do obliczania ilości deponowanych feromonów
+
+Feromony i heurystyka są trzymane jako tablice NumPy. Raz na iterację
+liczymy macierz choice_info = tau^alpha * eta^beta, więc mrówka w każdym
+kroku tylko odczytuje wiersz zamiast potęgować wartości dla każdego
+miasta. Parowanie, depozycja (np.add.at po krawędziach wszystkich mrówek)
+i obcinanie do [tau_min, tau_max] w MMAS to operacje na całych tablicach.
+
+Mrówka wybiera następne miasto tylko spośród `neighbors` najbliższych
+nieodwiedzonych sąsiadów (lista kandydatów), więc konstrukcja trasy
+kosztuje ~O(n*k) zamiast O(n^2). Gdy wszyscy kandydaci są już odwiedzeni,
+idzie do nieodwiedzonego miasta o największym choice_info.
+
+W trybie lockstep wszystkie mrówki iteracji budują trasy jednocześnie:
+maska odwiedzin n_ants x n, a w każdym kroku jedno losowanie odwrotną
+dystrybuantą (cumsum po wierszach) wybiera następne miasta całej kolonii.
+
+Ant Colony System (ant_colony_system) dokłada regułę q0, lokalną
+aktualizację feromonu przy konstrukcji i globalną tylko na best-so-far.
 """
 import random
-import math
+from bisect import bisect_right
+import numpy as np
+
+# Minimalny poziom feromonu w AS (chroni przed wyzerowaniem krawędzi)
+PHEROMONE_FLOOR = 0.0001
 
 
 def ant_colony_optimization(
@@ -29,7 +51,9 @@ def ant_colony_optimization(
     rho=0.5,
     q=100.0,
     initial_pheromone=1.0,
-    elitist_weight=0
+    elitist_weight=0,
+    neighbors=15,
+    lockstep=False
 ):
     """
     Algorytm Mrówkowy (Ant Colony Optimization)
@@ -44,128 +68,270 @@ def ant_colony_optimization(
         q: stała do obliczania deponowanych feromonów
         initial_pheromone: początkowa wartość feromonów na krawędziach
         elitist_weight: waga dla najlepszej mrówki (0 = brak elityzmu)
+        neighbors: rozmiar listy kandydatów przy konstrukcji
+                   (None = wybór spośród wszystkich nieodwiedzonych miast)
+        lockstep: czy budować trasy wszystkich mrówek jednocześnie
+                  (operacje na tablicach zamiast pętli po mrówkach)
     
     Returns:
         (best_route, best_dist)
     """
     n = tsp.n
-    dist_matrix = tsp.dist_matrix
     
     # === INICJALIZACJA ===
     
     # Macierz feromonów - początkowo równa wartość na wszystkich krawędziach
-    # feromony[i][j] = ilość feromonu na drodze z miasta i do j
-    pheromone = [[initial_pheromone for _ in range(n)] for _ in range(n)]
+    # pheromone[i, j] = ilość feromonu na drodze z miasta i do j
+    pheromone = np.full((n, n), float(initial_pheromone))
     
     # Macierz heurystyki - preferujemy krótsze krawędzie
-    # heuristic[i][j] = 1/odległość (im bliżej, tym większa wartość)
-    heuristic = [[0.0 for _ in range(n)] for _ in range(n)]
-    for i in range(n):
-        for j in range(n):
-            if i != j and dist_matrix[i][j] > 0:
-                heuristic[i][j] = 1.0 / dist_matrix[i][j]
+    # heuristic[i, j] = 1/odległość (im bliżej, tym większa wartość)
+    heuristic = _heuristic_matrix(tsp)
+    candidates = tsp.neighbor_lists(neighbors) if neighbors else None
     
     best_route = None
     best_dist = float('inf')
     
     # === PĘTLA GŁÓWNA ACO ===
     for iteration in range(n_iterations):
-        all_routes = []  # Trasy wszystkich mrówek w tej iteracji
-        all_distances = []  # Długości tras
+        # Reguła proporcjonalna liczona raz na iterację (feromony stoją w miejscu)
+        choice_info = _choice_info(pheromone, heuristic, alpha, beta)
         
         # --- KROK 1: Każda mrówka buduje swoją trasę ---
-        for ant in range(n_ants):
-            # Mrówka konstruuje trasę probabilistycznie
-            route = _construct_solution(n, pheromone, heuristic, alpha, beta)
-            dist = tsp.route_length(route)
-            all_routes.append(route)
-            all_distances.append(dist)
-            
-            # Aktualizuj najlepsze znalezione rozwiązanie
-            if dist < best_dist:
-                best_dist = dist
-                best_route = route[:]
+        all_routes = np.asarray(_construct_routes(n, n_ants, choice_info, candidates, lockstep))
+        all_distances = tsp.route_lengths(all_routes)  # Długości wszystkich tras naraz
+        
+        # Aktualizuj najlepsze znalezione rozwiązanie
+        ant = int(np.argmin(all_distances))
+        if all_distances[ant] < best_dist:
+            best_dist = float(all_distances[ant])
+            best_route = all_routes[ant].tolist()
         
         # --- KROK 2: Parowanie feromonów (zapominanie) ---
         # Symuluje "wysychanie" feromonów - stare ścieżki tracą siłę
-        for i in range(n):
-            for j in range(n):
-                pheromone[i][j] *= (1 - rho)  # Redukuj o współczynnik rho
-                pheromone[i][j] = max(pheromone[i][j], 0.0001)  # Min wartość
+        pheromone *= (1 - rho)  # Redukuj o współczynnik rho
+        np.maximum(pheromone, PHEROMONE_FLOOR, out=pheromone)  # Min wartość
         
         # --- KROK 3: Depozycja feromonów przez mrówki ---
         # Im krótsza trasa, tym więcej feromonu zostawia mrówka
-        for route, dist in zip(all_routes, all_distances):
-            deposit = q / dist  # Więcej feromonu dla krótszych tras
-            for i in range(n):
-                a = route[i]
-                b = route[(i + 1) % n]
-                # Dodaj feromon do krawędzi (w obu kierunkach)
-                pheromone[a][b] += deposit
-                pheromone[b][a] += deposit
+        _deposit(pheromone, all_routes, q / all_distances)
         
         # --- KROK 4 (opcja): Elityzm - wzmocnij najlepszą trasę ---
         if elitist_weight > 0 and best_route:
-            elite_deposit = elitist_weight * q / best_dist
-            for i in range(n):
-                a = best_route[i]
-                b = best_route[(i + 1) % n]
-                pheromone[a][b] += elite_deposit
-                pheromone[b][a] += elite_deposit
+            _deposit(pheromone, np.array([best_route]), [elitist_weight * q / best_dist])
     
     return best_route, best_dist
 
 
-def _construct_solution(n, pheromone, heuristic, alpha, beta):
+def _construct_routes(n, n_ants, choice_info, candidates=None, lockstep=False):
+    """
+    Trasy wszystkich mrówek jednej iteracji (lista list, a w trybie
+    lockstep tablica n_ants x n).
+    
+    Z listą kandydatów wartości choice_info dla par (miasto, kandydat)
+    są wybierane raz na iterację - mrówki czytają już tylko n x k liczb.
+    """
+    if lockstep:
+        return _construct_lockstep(n, n_ants, choice_info, candidates)
+    if candidates is None:
+        return [_construct_solution(n, choice_info) for _ in range(n_ants)]
+    
+    cand_info = np.take_along_axis(choice_info, np.array(candidates, dtype=np.intp), axis=1).tolist()
+    return [_construct_with_candidates(n, choice_info, candidates, cand_info)
+            for _ in range(n_ants)]
+
+
+def _construct_with_candidates(n, choice_info, candidates, cand_info):
+    """
+    Konstruuje trasę mrówki z listą kandydatów - ~O(n*k) zamiast O(n^2).
+    
+    Ruletka obejmuje tylko nieodwiedzonych kandydatów bieżącego miasta
+    (sumy skumulowane + bisect). Gdy wszyscy są odwiedzeni, mrówka idzie
+    do nieodwiedzonego miasta o największym choice_info (rzadkie, O(n)).
+    
+    Args:
+        candidates: listy kandydatów (tsp.neighbor_lists)
+        cand_info: cand_info[i][m] = choice_info[i, candidates[i][m]]
+    """
+    start = random.randint(0, n - 1)
+    route = [start]
+    visited = [False] * n
+    visited[start] = True
+    unvisited = np.ones(n)  # Ta sama informacja dla wyboru awaryjnego w NumPy
+    unvisited[start] = 0.0
+    current = start
+    
+    for _ in range(n - 1):
+        # Nieodwiedzeni kandydaci i sumy skumulowane ich wag
+        cities = []
+        cumulative = []
+        total = 0.0
+        for city, weight in zip(candidates[current], cand_info[current]):
+            if not visited[city]:
+                total += weight
+                cities.append(city)
+                cumulative.append(total)
+        
+        if total > 0:
+            # Wybór ruletką: pierwszy kandydat z sumą skumulowaną > r
+            pick = bisect_right(cumulative, random.random() * total)
+            next_city = cities[min(pick, len(cities) - 1)]
+        elif cities:
+            next_city = random.choice(cities)
+        else:
+            # Wszyscy kandydaci odwiedzeni - najlepsze nieodwiedzone miasto
+            weights = choice_info[current] * unvisited
+            next_city = int(np.argmax(weights))
+            if weights[next_city] <= 0:
+                next_city = random.choice(np.flatnonzero(unvisited).tolist())
+        
+        route.append(next_city)
+        visited[next_city] = True
+        unvisited[next_city] = 0.0
+        current = next_city
+    
+    return route
+
+
+def _construct_lockstep(n, n_ants, choice_info, candidates=None):
+    """
+    Konstruuje trasy wszystkich mrówek jednocześnie (krok po kroku).
+    
+    W każdym kroku: wiersze choice_info bieżących miast (albo ich
+    kandydatów) razy maska nieodwiedzonych, sumy skumulowane po wierszach
+    i jedno wektorowe losowanie odwrotną dystrybuantą dla całej kolonii.
+    Mrówki bez nieodwiedzonego kandydata idą do miasta o największym
+    choice_info - tak jak w _construct_with_candidates.
+    
+    Returns:
+        tablica tras n_ants x n
+    """
+    rng = np.random.default_rng(random.getrandbits(64))  # zgodne z random.seed
+    ants = np.arange(n_ants)
+    routes = np.empty((n_ants, n), dtype=np.intp)
+    current = rng.integers(0, n, n_ants)
+    routes[:, 0] = current
+    unvisited = np.ones((n_ants, n))  # 1.0 = nieodwiedzone, 0.0 = odwiedzone
+    unvisited[ants, current] = 0.0
+    
+    if candidates is not None:
+        cand = np.array(candidates, dtype=np.intp)
+        cand_info = np.take_along_axis(choice_info, cand, axis=1)
+        width = cand.shape[1]
+    else:
+        width = n
+    draws = rng.random((n, n_ants))  # Liczby losowe dla wszystkich kroków naraz
+    
+    for step in range(1, n):
+        # --- KROK 1: Wagi następnych miast dla całej kolonii ---
+        if candidates is not None:
+            rows = cand[current]
+            weights = cand_info[current] * unvisited[ants[:, None], rows]
+        else:
+            weights = choice_info[current] * unvisited
+        
+        # --- KROK 2: Ruletka - odwrotna dystrybuanta po wierszach ---
+        cumulative = np.cumsum(weights, axis=1)
+        r = draws[step] * cumulative[:, -1]
+        pick = np.count_nonzero(cumulative <= r[:, None], axis=1)
+        if candidates is not None:
+            next_cities = rows[ants, np.minimum(pick, width - 1)]
+        else:
+            next_cities = pick
+        
+        # --- KROK 3: Wybór awaryjny (brak nieodwiedzonych kandydatów) ---
+        stuck = np.flatnonzero(pick >= width)
+        if len(stuck):
+            weights = choice_info[current[stuck]] * unvisited[stuck]
+            best = np.argmax(weights, axis=1)
+            dead = weights[np.arange(len(stuck)), best] <= 0
+            if dead.any():
+                # Same zerowe wagi - losowe nieodwiedzone miasto
+                noise = unvisited[stuck[dead]] * rng.random((int(dead.sum()), n))
+                best[dead] = np.argmax(noise, axis=1)
+            next_cities[stuck] = best
+        
+        routes[:, step] = next_cities
+        unvisited[ants, next_cities] = 0.0
+        current = next_cities
+    
+    return routes
+
+
+def _construct_solution(n, choice_info):
     """
     Konstruuje trasę dla pojedynczej mrówki używając reguły proporcjonalnej.
     
     Mrówka wybiera następne miasto probabilistycznie:
-    P(i->j) = [feromon(i,j)]^alpha * [heurystyka(i,j)]^beta / suma
-    
-    alpha - waga feromonów (wpływ historii)
-    beta - waga heurystyki (wpływ odległości)
+    P(i->j) = choice_info[i, j] / suma po nieodwiedzonych
+    gdzie choice_info = [feromon]^alpha * [heurystyka]^beta (_choice_info).
     """
     # Losowy punkt startowy
     start = random.randint(0, n - 1)
     route = [start]
-    visited = {start}
+    unvisited = np.ones(n)  # 1.0 = nieodwiedzone, 0.0 = odwiedzone
+    unvisited[start] = 0.0
     current = start
     
     while len(route) < n:
-        # Oblicz prawdopodobieństwa dla nieodwiedzonych miast
-        probabilities = []
-        unvisited = []
+        # Wagi nieodwiedzonych miast (odwiedzone mają wagę 0)
+        weights = choice_info[current] * unvisited
+        cumulative = np.cumsum(weights)
+        total = cumulative[-1]
         
-        for city in range(n):
-            if city not in visited:
-                # Reguła proporcjonalna: τ^α * η^β
-                tau = pheromone[current][city] ** alpha
-                eta = heuristic[current][city] ** beta
-                prob = tau * eta
-                probabilities.append(prob)
-                unvisited.append(city)
-        
-        if not unvisited:
-            break
-        
-        # Normalizacja i wybór
-        total = sum(probabilities)
+        next_city = n
         if total > 0:
-            probabilities = [p / total for p in probabilities]
-            # Wybór ruletką
-            next_city = random.choices(unvisited, weights=probabilities, k=1)[0]
-        else:
+            # Wybór ruletką: pierwsze miasto z sumą skumulowaną > r
+            next_city = int(np.searchsorted(cumulative, random.random() * total, side='right'))
+        if next_city >= n:
             # Fallback: losowy wybór
-            next_city = random.choice(unvisited)
+            next_city = random.choice(np.flatnonzero(unvisited).tolist())
         
         route.append(next_city)
-        visited.add(next_city)
+        unvisited[next_city] = 0.0
         current = next_city
     
     return route
 
 
+def _heuristic_matrix(tsp):
+    """
+    Macierz heurystyki eta[i, j] = 1/odległość (0 na przekątnej
+    i dla miast o zerowej odległości).
+    """
+    dist = tsp.dist_array
+    heuristic = np.zeros_like(dist)
+    np.divide(1.0, dist, out=heuristic, where=dist > 0)
+    np.fill_diagonal(heuristic, 0.0)
+    return heuristic
+
+
+def _choice_info(pheromone, heuristic, alpha, beta):
+    """Macierz reguły proporcjonalnej: tau^alpha * eta^beta."""
+    return pheromone ** alpha * heuristic ** beta
+
+
+def _deposit(pheromone, routes, amounts):
+    """
+    Depozycja feromonu (w miejscu) na krawędziach wielu tras naraz.
+    
+    Args:
+        pheromone: macierz feromonów n x n
+        routes: tablica tras m x n
+        amounts: ilość feromonu dla każdej trasy (m wartości)
+    
+    np.add.at sumuje powtórzenia - ta sama krawędź w kilku trasach
+    dostaje wszystkie depozyty. Krawędzie są nieskierowane, więc
+    feromon trafia w obu kierunkach.
+    """
+    n = routes.shape[1]
+    a = routes.ravel()
+    b = np.roll(routes, -1, axis=1).ravel()
+    deposit = np.repeat(np.asarray(amounts, dtype=float), n)
+    np.add.at(pheromone, (a, b), deposit)
+    np.add.at(pheromone, (b, a), deposit)
+
+
 def aco_with_local_search(
     tsp,
     n_ants=20,
@@ -174,36 +340,33 @@ def aco_with_local_search(
     beta=2.0,
     rho=0.5,
     q=100.0,
-    local_search_iters=50
+    local_search_iters=50,
+    neighbors=15
 ):
     """
     ACO z lokalnym przeszukiwaniem (2-opt) po każdej konstrukcji.
     
     Ta wersja łączy ACO z lokalnym przeszukiwaniem, co często
     prowadzi do lepszych wyników niż samo ACO.
+    neighbors: rozmiar listy kandydatów (None = wszystkie miasta).
     """
     from utils.neighborhoods import two_opt
     
     n = tsp.n
-    dist_matrix = tsp.dist_matrix
     
-    pheromone = [[1.0 for _ in range(n)] for _ in range(n)]
-    heuristic = [[0.0 for _ in range(n)] for _ in range(n)]
-    for i in range(n):
-        for j in range(n):
-            if i != j and dist_matrix[i][j] > 0:
-                heuristic[i][j] = 1.0 / dist_matrix[i][j]
+    pheromone = np.ones((n, n))
+    heuristic = _heuristic_matrix(tsp)
+    candidates = tsp.neighbor_lists(neighbors) if neighbors else None
     
     best_route = None
     best_dist = float('inf')
     
     for iteration in range(n_iterations):
+        choice_info = _choice_info(pheromone, heuristic, alpha, beta)
         all_routes = []
         all_distances = []
         
-        for ant in range(n_ants):
-            route = _construct_solution(n, pheromone, heuristic, alpha, beta)
-            
+        for route in _construct_routes(n, n_ants, choice_info, candidates):
             # Lokalne przeszukiwanie 2-opt
             current_dist = tsp.route_length(route)
             for _ in range(local_search_iters):
@@ -221,18 +384,9 @@ def aco_with_local_search(
                 best_route = route[:]
         
         # Aktualizacja feromonów
-        for i in range(n):
-            for j in range(n):
-                pheromone[i][j] *= (1 - rho)
-                pheromone[i][j] = max(pheromone[i][j], 0.0001)
-        
-        for route, dist in zip(all_routes, all_distances):
-            deposit = q / dist
-            for i in range(n):
-                a = route[i]
-                b = route[(i + 1) % n]
-                pheromone[a][b] += deposit
-                pheromone[b][a] += deposit
+        pheromone *= (1 - rho)
+        np.maximum(pheromone, PHEROMONE_FLOOR, out=pheromone)
+        _deposit(pheromone, np.array(all_routes), q / np.array(all_distances))
     
     return best_route, best_dist
 
@@ -244,7 +398,15 @@ def max_min_ant_system(
     alpha=1.0,
     beta=2.0,
     rho=0.1,
-    q=100.0
+    q=100.0,
+    neighbors=15,
+    lockstep=False,
+    stagnation="branching",
+    branching_limit=1.05,
+    lambda_branching=0.05,
+    stagnation_limit=50,
+    max_restarts=3,
+    stats=None
 ):
     """
     MAX-MIN Ant System (MMAS) - ulepszona wersja ACO.
@@ -253,9 +415,30 @@ def max_min_ant_system(
     1. Tylko najlepsza mrówka deponuje feromony
     2. Wartości feromonów ograniczone do [tau_min, tau_max]
     3. Inicjalizacja z maksymalnym poziomem feromonów
+    4. USPRAWNIENIE: wykrywanie stagnacji - ponowna inicjalizacja feromonów
+       do tau_max, a po max_restarts bezowocnych restartach z rzędu koniec
+    
+    Args:
+        tsp: obiekt TSP z macierzą odległości
+        n_ants, n_iterations, alpha, beta, rho, q: jak w ant_colony_optimization
+        neighbors: rozmiar listy kandydatów (None = wszystkie miasta)
+        lockstep: czy budować trasy wszystkich mrówek jednocześnie
+        stagnation: kryterium stagnacji - "branching" (średni współczynnik
+                    lambda-rozgałęzienia < branching_limit), "no_improve"
+                    (stagnation_limit iteracji bez poprawy) lub None (brak)
+        branching_limit: próg dla "branching" (1.0 = każde miasto ma już
+                         tylko 2 krawędzie z istotnym feromonem)
+        lambda_branching: lambda we współczynniku rozgałęzienia
+        stagnation_limit: liczba iteracji bez poprawy dla "no_improve"
+        max_restarts: po ilu restartach z rzędu bez poprawy najlepszej trasy
+                      zakończyć (None = nigdy, zawsze n_iterations)
+        stats: opcjonalny słownik - iterations (wykonane), restarts,
+               restart_iterations, best_iteration, terminated_early
+    
+    Returns:
+        (best_route, best_dist)
     """
     n = tsp.n
-    dist_matrix = tsp.dist_matrix
     
     # Szacunkowe tau_max i tau_min
     # Heurystyka NN daje przybliżenie długości optymalnej trasy
@@ -266,43 +449,46 @@ def max_min_ant_system(
     tau_min = tau_max / (2 * n)
     
     # Inicjalizacja z tau_max
-    pheromone = [[tau_max for _ in range(n)] for _ in range(n)]
-    
-    heuristic = [[0.0 for _ in range(n)] for _ in range(n)]
-    for i in range(n):
-        for j in range(n):
-            if i != j and dist_matrix[i][j] > 0:
-                heuristic[i][j] = 1.0 / dist_matrix[i][j]
+    pheromone = np.full((n, n), tau_max)
+    heuristic = _heuristic_matrix(tsp)
+    candidates = tsp.neighbor_lists(neighbors) if neighbors else None
     
     best_route = None
     best_dist = float('inf')
     iteration_best_route = None
     iteration_best_dist = float('inf')
     
+    best_iteration = 0
+    last_restart = 0  # Iteracja ostatniego restartu feromonów
+    restart_iterations = []
+    fruitless_restarts = 0  # Restarty z rzędu, po których nie było poprawy
+    improved_since_restart = False
+    terminated_early = False
+    iterations_done = 0
+    
     for iteration in range(n_iterations):
-        iteration_best_route = None
-        iteration_best_dist = float('inf')
+        iterations_done = iteration + 1
+        choice_info = _choice_info(pheromone, heuristic, alpha, beta)
+        all_routes = np.asarray(_construct_routes(n, n_ants, choice_info, candidates, lockstep))
+        all_distances = tsp.route_lengths(all_routes)
         
-        for ant in range(n_ants):
-            route = _construct_solution(n, pheromone, heuristic, alpha, beta)
-            dist = tsp.route_length(route)
-            
-            if dist < iteration_best_dist:
-                iteration_best_dist = dist
-                iteration_best_route = route[:]
-            
-            if dist < best_dist:
-                best_dist = dist
-                best_route = route[:]
+        ant = int(np.argmin(all_distances))
+        iteration_best_dist = float(all_distances[ant])
+        iteration_best_route = all_routes[ant].tolist()
+        
+        if iteration_best_dist < best_dist:
+            best_dist = iteration_best_dist
+            best_route = iteration_best_route[:]
+            best_iteration = iteration
+            improved_since_restart = True
         
         # Parowanie
-        for i in range(n):
-            for j in range(n):
-                pheromone[i][j] *= (1 - rho)
+        pheromone *= (1 - rho)
         
         # Tylko najlepsza mrówka (iteracji lub globalna) deponuje
         # Używamy globalnej najlepszej częściej w późniejszych iteracjach
-        if random.random() < iteration / n_iterations:
+        # (licząc od ostatniego restartu - po nim znów przewaga iteracyjnej)
+        if random.random() < (iteration - last_restart) / (n_iterations - last_restart):
             deposit_route = best_route
             deposit_dist = best_dist
         else:
@@ -310,16 +496,199 @@ def max_min_ant_system(
             deposit_dist = iteration_best_dist
         
         if deposit_route and deposit_dist > 0:
-            deposit = q / deposit_dist
-            for i in range(n):
-                a = deposit_route[i]
-                b = deposit_route[(i + 1) % n]
-                pheromone[a][b] += deposit
-                pheromone[b][a] += deposit
+            _deposit(pheromone, np.array([deposit_route]), [q / deposit_dist])
         
         # Ograniczenie feromonów do [tau_min, tau_max]
-        for i in range(n):
-            for j in range(n):
-                pheromone[i][j] = max(tau_min, min(tau_max, pheromone[i][j]))
+        np.clip(pheromone, tau_min, tau_max, out=pheromone)
+        
+        # --- Stagnacja: kolonia zbiegła do jednej trasy ---
+        if stagnation == "branching":
+            branching = _branching_factor(pheromone, tau_min, tau_max, lambda_branching)
+            stagnated = branching < branching_limit
+        elif stagnation == "no_improve":
+            stagnated = iteration - max(best_iteration, last_restart) >= stagnation_limit
+        else:
+            stagnated = False
+        
+        if stagnated and iteration + 1 < n_iterations:
+            fruitless_restarts = 0 if improved_since_restart else fruitless_restarts + 1
+            if max_restarts is not None and fruitless_restarts >= max_restarts:
+                terminated_early = True
+                break
+            # Ponowna inicjalizacja śladów feromonowych
+            pheromone.fill(tau_max)
+            restart_iterations.append(iteration)
+            last_restart = iteration
+            improved_since_restart = False
+    
+    if stats is not None:
+        stats.update({
+            'iterations': iterations_done,
+            'restarts': len(restart_iterations),
+            'restart_iterations': restart_iterations,
+            'best_iteration': best_iteration,
+            'terminated_early': terminated_early
+        })
     
     return best_route, best_dist
+
+
+def _branching_factor(pheromone, tau_min, tau_max, lam=0.05):
+    """
+    Średni współczynnik lambda-rozgałęzienia (znormalizowany).
+    
+    Krawędź jest "żywa", gdy ma feromon >= tau_min + lam*(tau_max - tau_min).
+    Wynik to średnia liczba żywych krawędzi miasta podzielona przez 2 -
+    zbiega do 1.0, gdy kolonia ma już tylko jedną trasę. Progiem są granice
+    MMAS, a nie min/max wiersza: zaraz po depozycji wszystkie wartości
+    w wierszu są bliskie tau_max i próg względny dałby fałszywą stagnację.
+    """
+    n = len(pheromone)
+    threshold = tau_min + lam * (tau_max - tau_min)
+    alive = np.count_nonzero(pheromone >= threshold)
+    alive -= np.count_nonzero(np.diagonal(pheromone) >= threshold)
+    return alive / (2.0 * n)
+
+
+def ant_colony_system(
+    tsp,
+    n_ants=10,
+    n_iterations=100,
+    beta=2.0,
+    rho=0.1,
+    xi=0.1,
+    q0=0.9,
+    neighbors=15
+):
+    """
+    USPRAWNIENIE: Ant Colony System (ACS)
+    
+    Różnice od podstawowego ACO:
+    1. Reguła pseudolosowo-proporcjonalna: z prawdopodobieństwem q0 mrówka
+       bierze najlepszego kandydata (argmax tau * eta^beta), w pozostałych
+       przypadkach losuje ruletką jak w AS
+    2. Lokalna aktualizacja: każda przebyta krawędź od razu traci część
+       feromonu (tau <- (1-xi)*tau + xi*tau0), więc kolejne mrówki chętniej
+       próbują innych krawędzi
+    3. Globalna aktualizacja tylko na trasie best-so-far
+       (tau <- (1-rho)*tau + rho/L_best) - bez parowania całej macierzy
+    
+    Obie aktualizacje dotykają O(n) krawędzi na iterację, więc feromony
+    są tu listami list (szybszy dostęp pojedynczy niż w NumPy).
+    
+    Args:
+        tsp: obiekt TSP z macierzą odległości
+        n_ants: liczba mrówek (ACS zwykle wystarcza ~10)
+        n_iterations: liczba iteracji
+        beta: waga heurystyki 1/odległość
+        rho: współczynnik globalnego parowania/depozycji
+        xi: współczynnik lokalnej aktualizacji
+        q0: prawdopodobieństwo wyboru zachłannego (eksploatacji)
+        neighbors: rozmiar listy kandydatów
+    
+    Returns:
+        (best_route, best_dist)
+    """
+    n = tsp.n
+    dm = tsp.dist_matrix
+    
+    # tau0 = 1 / (n * L_nn) - poziom startowy i cel lokalnej aktualizacji
+    from algorithms.nn import nearest_neighbor
+    _, nn_dist = nearest_neighbor(tsp)
+    tau0 = 1.0 / (n * nn_dist) if nn_dist > 0 else 1.0
+    
+    pheromone = [[tau0] * n for _ in range(n)]
+    eta_beta = (_heuristic_matrix(tsp) ** beta).tolist()
+    candidates = tsp.neighbor_lists(neighbors)
+    
+    best_route = None
+    best_dist = float('inf')
+    
+    for iteration in range(n_iterations):
+        # --- KROK 1: Konstrukcja tras z lokalną aktualizacją feromonów ---
+        for ant in range(n_ants):
+            route = _construct_acs(n, pheromone, eta_beta, candidates, q0, xi, tau0)
+            
+            dist = 0.0
+            prev = route[-1]
+            for city in route:
+                dist += dm[prev][city]
+                prev = city
+            
+            if dist < best_dist:
+                best_dist = dist
+                best_route = route
+        
+        # --- KROK 2: Globalna aktualizacja - tylko trasa best-so-far ---
+        deposit = rho / best_dist if best_dist > 0 else 0.0
+        prev = best_route[-1]
+        for city in best_route:
+            value = (1 - rho) * pheromone[prev][city] + deposit
+            pheromone[prev][city] = pheromone[city][prev] = value
+            prev = city
+    
+    return best_route, tsp.route_length(best_route)
+
+
+def _construct_acs(n, pheromone, eta_beta, candidates, q0, xi, tau0):
+    """
+    Trasa jednej mrówki ACS (reguła q0 + lokalna aktualizacja, w miejscu).
+    
+    Wybór ogranicza się do nieodwiedzonych kandydatów; gdy wszyscy są
+    odwiedzeni, mrówka idzie do nieodwiedzonego miasta o największym
+    tau * eta^beta. Krawędź domykająca cykl też dostaje aktualizację lokalną.
+    """
+    start = random.randint(0, n - 1)
+    route = [start]
+    visited = [False] * n
+    visited[start] = True
+    current = start
+    
+    for _ in range(n - 1):
+        tau_row = pheromone[current]
+        eta_row = eta_beta[current]
+        exploit = random.random() < q0
+        
+        next_city = -1
+        best_weight = -1.0
+        cities = []
+        cumulative = []
+        total = 0.0
+        for city in candidates[current]:
+            if visited[city]:
+                continue
+            weight = tau_row[city] * eta_row[city]
+            if exploit:
+                if weight > best_weight:
+                    best_weight = weight
+                    next_city = city
+            else:
+                total += weight
+                cities.append(city)
+                cumulative.append(total)
+        
+        if not exploit and cities:
+            if total > 0:
+                pick = bisect_right(cumulative, random.random() * total)
+                next_city = cities[min(pick, len(cities) - 1)]
+            else:
+                next_city = random.choice(cities)
+        
+        if next_city < 0:
+            # Wszyscy kandydaci odwiedzeni - najlepsze nieodwiedzone miasto
+            next_city = max((city for city in range(n) if not visited[city]),
+                            key=lambda city: tau_row[city] * eta_row[city])
+        
+        # Lokalna aktualizacja przebytej krawędzi
+        value = (1 - xi) * tau_row[next_city] + xi * tau0
+        pheromone[current][next_city] = pheromone[next_city][current] = value
+        
+        route.append(next_city)
+        visited[next_city] = True
+        current = next_city
+    
+    if n > 1:
+        value = (1 - xi) * pheromone[current][start] + xi * tau0
+        pheromone[current][start] = pheromone[start][current] = value
+    
+    return route
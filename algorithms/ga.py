@@ -5,7 +5,7 @@ dla problemu komiwojażera (TSP).
 
 Zawiera:
 - 3 metody selekcji rodziców: turniejowa, ruletkowa, rankingowa
-- 3 metody krzyżowania: OX, PMX, CX
+- 5 metod krzyżowania: OX, PMX, CX oraz krawędziowe ERX i EAX
 - 3 rodzaje mutacji: swap, insert, inversion (2-opt)
 
 Parametry:
@@ -14,13 +14,42 @@ Parametry:
 - p_mut: prawdopodobieństwo mutacji
 - p_cross: prawdopodobieństwo krzyżowania
 - selection_type: "tournament", "roulette", "ranking"
-- crossover_type: "ox", "pmx", "cx"
+- crossover_type: "ox", "pmx", "cx", "erx", "eax"
 - mutation_type: "swap", "insert", "inversion"
 - tournament_size: rozmiar turnieju (dla selekcji turniejowej)
 - elitism: liczba najlepszych osobników przenoszonych bez zmian
+
+Tryb memetyczny (local_search): każde dziecko (lub ich część ls_fraction)
+jest poprawiane ograniczonym przeszukiwaniem lokalnym 2-opt / Or-opt
+z oceną delt ruchów - GA nie musi naprawiać skrzyżowań losowymi mutacjami.
+
+GA stacjonarny (steady_state_ga): zamiast całych generacji pojedyncze
+dzieci zastępują najgorszego osobnika (kopiec kosztów), o ile są od niego
+lepsze i nie ma ich już w populacji (zbiór haszy Zobrista).
+
+Model wyspowy (island_genetic_algorithm): K podpopulacji w osobnych
+procesach, co migration_interval generacji najlepsze osobniki wędrują
+do sąsiedniej wyspy na pierścieniu.
+
+Populacja przechowywana jest jako tablica NumPy (pop_size x n) z podwójnym
+buforowaniem: potomkowie zapisywani są do drugiej, wcześniej zaalokowanej
+tablicy, po czym bufory zamieniają się miejscami. Fitness całej populacji
+liczony jest jednym wektorowym gatherem (tsp.route_lengths), a elita
+wybierana przez argpartition - O(pop_size) zamiast sortowania.
+
+Każdy osobnik niesie swój koszt i hasz Zobrista: elita i dzieci będące
+kopiami rodzica nie są oceniane ponownie, koszt zmutowanej kopii liczony
+jest deltą ruchu w O(1), a dzieci po krzyżowaniu sprawdzane są najpierw
+w ograniczonej pamięci podręcznej hasz -> koszt (duplikaty tras).
 """
+import heapq
+import math
 import random
-from utils.neighborhoods import swap, insert, two_opt
+from multiprocessing import Process, Queue
+from queue import Empty
+import numpy as np
+from utils.neighborhoods import swap, sample_move, apply_move_array, MOVE_DELTA, MOVE_EDGES, APPLY_MOVE
+from utils.zobrist import ZobristHash
 
 
 def genetic_algorithm(
@@ -34,7 +63,12 @@ def genetic_algorithm(
     mutation_type="swap",
     tournament_size=3,
     elitism=2,
-    use_nn_start=False
+    use_nn_start=False,
+    cache_size=10000,
+    local_search=None,
+    ls_fraction=1.0,
+    ls_budget=1000,
+    stats=None
 ):
     """
     Algorytm Genetyczny (GA)
@@ -46,100 +80,272 @@ def genetic_algorithm(
         p_mut: prawdopodobieństwo mutacji
         p_cross: prawdopodobieństwo krzyżowania
         selection_type: metoda selekcji ("tournament", "roulette", "ranking")
-        crossover_type: metoda krzyżowania ("ox", "pmx", "cx")
+        crossover_type: metoda krzyżowania ("ox", "pmx", "cx", "erx", "eax")
         mutation_type: typ mutacji ("swap", "insert", "inversion")
         tournament_size: rozmiar turnieju
         elitism: liczba elitarnych osobników
         use_nn_start: czy zaszczepić populację rozwiązaniem NN (USPRAWNIENIE)
+        cache_size: maksymalna liczba wpisów pamięci hasz -> koszt (0 = wyłączona)
+        local_search: tryb memetyczny - None (wyłączony), "two_opt", "or_opt"
+                      lub "both" (2-opt i Or-opt naraz)
+        ls_fraction: udział dzieci poprawianych przeszukiwaniem lokalnym
+        ls_budget: maksymalna liczba ocenianych ruchów na jedno dziecko
+        stats: opcjonalny słownik - wypełniany liczbą ocen:
+               evaluations (pełne), delta_evaluations, cache_hits,
+               inherited (koszty przejęte bez zmian), saved_fraction
+               (udział ocen zaoszczędzonych względem oceny każdego osobnika),
+               ls_moves (ruchy ocenione przez przeszukiwanie lokalne)
     
     Returns:
         (best_route, best_dist)
     """
+    # 1. Inicjalizacja populacji i ocena startowa
+    population = _init_population(tsp, pop_size, use_nn_start)
+    costs = tsp.route_lengths(population)
+    
+    counters = {'evaluations': pop_size}
+    population, costs, best_route, best_dist = _evolve(
+        tsp, population, costs, generations,
+        p_mut=p_mut,
+        p_cross=p_cross,
+        selection_type=selection_type,
+        crossover_type=crossover_type,
+        mutation_type=mutation_type,
+        tournament_size=tournament_size,
+        elitism=elitism,
+        cache_size=cache_size,
+        local_search=local_search,
+        ls_fraction=ls_fraction,
+        ls_budget=ls_budget,
+        counters=counters,
+        zobrist=ZobristHash(tsp.n)
+    )
+    
+    if stats is not None:
+        baseline = pop_size * (generations + 1)  # Ocena każdego osobnika
+        stats.update(counters)
+        stats['saved_fraction'] = 1 - counters['evaluations'] / baseline
+    
+    return best_route, tsp.route_length(best_route)
+
+
+def _evolve(
+    tsp,
+    population,
+    costs,
+    generations,
+    p_mut=0.1,
+    p_cross=0.9,
+    selection_type="tournament",
+    crossover_type="ox",
+    mutation_type="swap",
+    tournament_size=3,
+    elitism=2,
+    cache_size=10000,
+    local_search=None,
+    ls_fraction=1.0,
+    ls_budget=1000,
+    counters=None,
+    zobrist=None
+):
+    """
+    Silnik GA: ewoluuje podaną populację przez `generations` generacji.
+    
+    Używany przez genetic_algorithm oraz przez wyspy island_genetic_algorithm
+    (każda wyspa wywołuje go między migracjami).
+    
+    Args:
+        population: tablica (pop_size x n) - nadpisywana w trakcie
+        costs: koszty osobników population
+        counters: opcjonalny słownik - dolicza evaluations, delta_evaluations,
+                  cache_hits, inherited, ls_moves
+        zobrist: klucze Zobrista (ZobristHash) - tworzone raz na przebieg
+                 i przekazywane, bo budowa tablicy n x n kosztuje O(n^2)
+                 (None = nowe klucze)
+    
+    Returns:
+        (populacja, koszty, best_route, best_dist) - ostatnia generacja
+        oraz najlepszy osobnik ze wszystkich generacji
+    """
     n = tsp.n
+    dm = tsp.dist_matrix
     
-    # 1. Inicjalizacja populacji
-    population = []
+    pop_size = len(population)
     
-    # USPRAWNIENIE: Zaszczep populację rozwiązaniem NN
-    if use_nn_start:
-        from algorithms.nn import nearest_neighbor
-        for start in range(min(5, n)):
-            nn_route, _ = nearest_neighbor(tsp, start=start)
-            population.append(list(nn_route))
+    # Drugi bufor na kolejną generację
+    next_population = np.empty_like(population)
+    elitism = min(elitism, pop_size)
+    
+    # Koszty i hasze niesione razem z osobnikami
+    if zobrist is None:
+        zobrist = ZobristHash(n)
+    costs = np.array(costs, dtype=float)
+    next_costs = np.empty_like(costs)
+    hashes = zobrist.tour_hashes(population)
+    cache = {}
+    _cache_store(cache, hashes, costs.tolist(), cache_size)
+    evaluations = 0
+    delta_evaluations = 0
+    cache_hits = 0
+    inherited = 0
+    ls_moves = 0
     
-    # Reszta populacji losowa
-    while len(population) < pop_size:
-        individual = list(range(n))
-        random.shuffle(individual)
-        population.append(individual)
+    # Tryb memetyczny: sąsiedztwa przeszukiwania lokalnego i listy kandydatów
+    ls_neighborhoods = LOCAL_SEARCH_MOVES.get(local_search)
+    neighbors = tsp.neighbor_lists(8) if ls_neighborhoods else None
     
     best_route = None
     best_dist = float('inf')
     
-    # Słowniki funkcji
+    # Słowniki funkcji (selekcja zwraca od razu wszystkie indeksy rodziców)
     selection_funcs = {
-        "tournament": lambda pop, costs: tournament_selection(pop, costs, tournament_size),
-        "roulette": roulette_selection,
-        "ranking": ranking_selection
+        "tournament": lambda costs, count, rng: _tournament_indices(costs, count, rng, tournament_size),
+        "roulette": _roulette_indices,
+        "ranking": _ranking_indices
     }
     
-    crossover_funcs = {
-        "ox": order_crossover,
-        "pmx": pmx_crossover,
-        "cx": cycle_crossover
-    }
+    crossover_funcs = _crossover_funcs(tsp)
     
-    mutation_funcs = {
-        "swap": swap,
-        "insert": insert,
-        "inversion": two_opt  # 2-opt jako mutacja inwersyjna
+    # Mutacje wykonywane w miejscu na wierszu populacji (ten sam rozkład
+    # ruchów co swap / insert / two_opt z neighborhoods.py)
+    mutation_moves = {
+        "swap": "swap",
+        "insert": "insert",
+        "inversion": "two_opt"  # 2-opt jako mutacja inwersyjna
     }
     
     select_func = selection_funcs.get(selection_type, selection_funcs["tournament"])
-    cross_func = crossover_funcs.get(crossover_type, crossover_funcs["ox"])
-    mutate_func = mutation_funcs.get(mutation_type, mutation_funcs["swap"])
+    if crossover_type not in crossover_funcs:
+        crossover_type = "ox"
+    cross_func = crossover_funcs[crossover_type]
+    mutation_move = mutation_moves.get(mutation_type, "swap")
+    move_delta = MOVE_DELTA[mutation_move]
+    move_edges = MOVE_EDGES[mutation_move]
+    
+    rng = np.random.default_rng(random.getrandbits(64))
+    n_children = pop_size - elitism
     
     # === PĘTLA GŁÓWNA: Ewolucja przez kolejne generacje ===
     for gen in range(generations):
         
-        # --- KROK 1: Oceń wszystkich osobników (fitness = długość trasy) ---
+        # --- KROK 1: Koszty znane - oceniane są tylko nowe dzieci (KROK 3) ---
         # Im krótsza trasa, tym lepszy fitness (minimalizujemy)
-        costs = [tsp.route_length(ind) for ind in population]
         
         # Aktualizacja najlepszego globalnego wyniku
-        for i, c in enumerate(costs):
-            if c < best_dist:
-                best_dist = c
-                best_route = population[i][:]  # Zapisz kopię
+        best_idx = int(np.argmin(costs))
+        if costs[best_idx] < best_dist:
+            best_dist = float(costs[best_idx])
+            best_route = population[best_idx].tolist()  # Zapisz kopię
         
         # --- KROK 2: Elityzm - zachowaj najlepszych bez zmian ---
         # Gwarantuje, że najlepsze rozwiązanie nie zostanie utracone
-        elite_indices = sorted(range(len(costs)), key=lambda i: costs[i])[:elitism]
-        elite = [population[i][:] for i in elite_indices]
-        
-        new_pop = elite[:]  # Nowa populacja zaczyna od elity
+        elite_indices = _elite_indices(costs, elitism)
+        next_population[:elitism] = population[elite_indices]
+        next_costs[:elitism] = costs[elite_indices]
+        next_hashes = [hashes[i] for i in elite_indices]
         
         # --- KROK 3: Twórz nowych potomków aż do wypełnienia populacji ---
-        while len(new_pop) < pop_size:
-            # SELEKCJA: Wybierz dwóch rodziców
-            p1 = select_func(population, costs)  # Rodzic 1
-            p2 = select_func(population, costs)  # Rodzic 2
-            
-            # KRZYŻOWANIE: Połącz geny rodziców
-            if random.random() < p_cross:
-                child = cross_func(p1, p2)  # Dziecko z genami obu rodziców
-            else:
-                child = p1[:]  # Brak krzyżowania - kopia rodzica
-            
-            # MUTACJA: Losowa modyfikacja potomka
-            if random.random() < p_mut:
-                child = mutate_func(child)
-            
-            new_pop.append(child)
+        children = next_population[elitism:]  # Widok na drugi bufor
+        child_costs = next_costs[elitism:]
+        
+        # SELEKCJA: Indeksy par rodziców dla całej generacji jednym losowaniem
+        # (struktura losowania budowana raz na generację)
+        parent_idx = select_func(costs, 2 * n_children, rng)
+        idx1, idx2 = parent_idx[:n_children], parent_idx[n_children:]
+        parents1 = population[idx1]
+        parents2 = population[idx2]
+        
+        # KRZYŻOWANIE: Połącz geny rodziców
+        crossed = rng.random(n_children) < p_cross
+        if crossover_type in BATCH_CROSSOVERS:
+            # Cała generacja dzieci jednym wywołaniem wektorowym
+            BATCH_CROSSOVERS[crossover_type](parents1, parents2, rng, out=children)
+            children[~crossed] = parents1[~crossed]  # Brak krzyżowania - kopia rodzica
+        else:
+            for k in range(n_children):
+                if crossed[k]:
+                    children[k] = cross_func(parents1[k].tolist(), parents2[k].tolist())
+                else:
+                    children[k] = parents1[k]
+        
+        # Kopie rodziców dziedziczą koszt i hasz
+        child_costs[:] = costs[idx1]
+        child_hashes = [hashes[i] for i in idx1.tolist()]
+        fresh = crossed.copy()  # Dzieci wymagające oceny
+        
+        # MUTACJA: Losowa modyfikacja potomka (w miejscu)
+        mutated_copies = 0
+        mutants = np.flatnonzero(rng.random(n_children) < p_mut) if n >= 2 else []
+        for k in mutants:
+            a, b = sample_move(n, mutation_move)
+            child = children[k]
+            if not fresh[k]:
+                if n >= 5:
+                    # Koszt i hasz zmutowanej kopii w O(1)
+                    removed, added = move_edges(child, a, b)
+                    child_costs[k] += move_delta(child, dm, a, b)
+                    child_hashes[k] = zobrist.move_hash(child_hashes[k], removed, added)
+                    mutated_copies += 1
+                else:
+                    fresh[k] = True  # Dla bardzo małych n - pełna ocena
+            apply_move_array(child, mutation_move, a, b)
+        
+        delta_evaluations += mutated_copies
+        inherited += n_children - int(fresh.sum()) - mutated_copies
         
-        population = new_pop[:pop_size]
+        # PRZESZUKIWANIE LOKALNE (tryb memetyczny)
+        if ls_neighborhoods:
+            for k in np.flatnonzero(rng.random(n_children) < ls_fraction):
+                route = children[k].tolist()
+                delta, used = _local_search(route, dm, neighbors, ls_neighborhoods, ls_budget)
+                ls_moves += used
+                if delta < 0:
+                    children[k] = route
+                    if not fresh[k]:
+                        # Koszt znany - wystarczy delta, hasz liczymy od nowa
+                        child_costs[k] += delta
+                        child_hashes[k] = zobrist.tour_hash(route)
+        
+        # OCENA: nowe dzieci - najpierw pamięć podręczna, potem wektorowo
+        fresh_idx = np.flatnonzero(fresh)
+        if len(fresh_idx):
+            fresh_hashes = zobrist.tour_hashes(children[fresh_idx])
+            missing = []
+            for k, h in zip(fresh_idx.tolist(), fresh_hashes):
+                child_hashes[k] = h
+                cached = cache.get(h)
+                if cached is None:
+                    missing.append(k)
+                else:
+                    child_costs[k] = cached
+                    cache_hits += 1
+            if missing:
+                missing_costs = tsp.route_lengths(children[missing])
+                child_costs[missing] = missing_costs
+                _cache_store(cache, [child_hashes[k] for k in missing],
+                             missing_costs.tolist(), cache_size)
+                evaluations += len(missing)
+        
+        # Zamiana buforów - bez alokacji nowej populacji
+        population, next_population = next_population, population
+        costs, next_costs = next_costs, costs
+        hashes = next_hashes + child_hashes
+    
+    # Ostatnia generacja jest już oceniona
+    best_idx = int(np.argmin(costs))
+    if costs[best_idx] < best_dist:
+        best_dist = float(costs[best_idx])
+        best_route = population[best_idx].tolist()
     
-    return best_route, best_dist
+    if counters is not None:
+        for key, value in (('evaluations', evaluations),
+                           ('delta_evaluations', delta_evaluations),
+                           ('cache_hits', cache_hits),
+                           ('inherited', inherited),
+                           ('ls_moves', ls_moves)):
+            counters[key] = counters.get(key, 0) + value
+    
+    return population, costs, best_route, best_dist
 
 
 def ga_adaptive_mutation(
@@ -149,7 +355,8 @@ def ga_adaptive_mutation(
     initial_p_mut=0.1,
     selection_type="tournament",
     crossover_type="ox",
-    use_nn_start=False
+    use_nn_start=False,
+    diversity_measure="edges"
 ):
     """
     USPRAWNIENIE AUTORSKIE: GA z adaptacyjnym prawdopodobieństwem mutacji
@@ -161,37 +368,35 @@ def ga_adaptive_mutation(
     - Uniknąć przedwczesnej konwergencji
     - Zachować eksplorację gdy potrzeba
     - Intensyfikować gdy populacja jest różnorodna
-    """
-    n = tsp.n
     
-    population = []
-    if use_nn_start:
-        from algorithms.nn import nearest_neighbor
-        for start in range(min(5, n)):
-            nn_route, _ = nearest_neighbor(tsp, start=start)
-            population.append(list(nn_route))
-            
-    while len(population) < pop_size:
-        individual = list(range(n))
-        random.shuffle(individual)
-        population.append(individual)
+    diversity_measure wybiera miarę różnorodności (wszystkie w [0, 1],
+    patrz _population_diversity): "edges" - udział unikalnych krawędzi,
+    "entropy" - entropia częstości krawędzi, "pairwise" - średnia
+    odległość krawędziowa losowych par osobników.
+    """
+    population = _init_population(tsp, pop_size, use_nn_start)
+    next_population = np.empty_like(population)
+    elitism = min(2, pop_size)
     
     best_route = None
     best_dist = float('inf')
     
     p_mut = initial_p_mut
+    rng = np.random.default_rng(random.getrandbits(64))
+    if diversity_measure not in ("edges", "entropy", "pairwise"):
+        diversity_measure = "edges"
     
     for gen in range(generations):
-        costs = [tsp.route_length(ind) for ind in population]
+        costs = tsp.route_lengths(population)
         
         # Aktualizacja najlepszego
-        for i, c in enumerate(costs):
-            if c < best_dist:
-                best_dist = c
-                best_route = population[i][:]
+        best_idx = int(np.argmin(costs))
+        if costs[best_idx] < best_dist:
+            best_dist = float(costs[best_idx])
+            best_route = population[best_idx].tolist()
         
         # ADAPTACJA: Oblicz różnorodność populacji
-        diversity = _calculate_diversity(population)
+        diversity = _population_diversity(population, rng)[diversity_measure]
         
         # Dostosuj prawdopodobieństwo mutacji
         if diversity < 0.3:  # Mała różnorodność
@@ -200,22 +405,21 @@ def ga_adaptive_mutation(
             p_mut = max(0.01, p_mut * 0.8)  # Zmniejsz mutację
         
         # Elityzm
-        elite_indices = sorted(range(len(costs)), key=lambda i: costs[i])[:2]
-        elite = [population[i][:] for i in elite_indices]
+        elite_indices = _elite_indices(costs, elitism)
+        next_population[:elitism] = population[elite_indices]
         
-        new_pop = elite[:]
+        n_children = pop_size - elitism
+        if selection_type == "tournament":
+            parent_idx = _tournament_indices(costs, 2 * n_children, rng)
+        elif selection_type == "roulette":
+            parent_idx = _roulette_indices(costs, 2 * n_children, rng)
+        else:
+            parent_idx = _ranking_indices(costs, 2 * n_children, rng)
         
-        while len(new_pop) < pop_size:
-            if selection_type == "tournament":
-                p1 = tournament_selection(population, costs)
-                p2 = tournament_selection(population, costs)
-            elif selection_type == "roulette":
-                p1 = roulette_selection(population, costs)
-                p2 = roulette_selection(population, costs)
-            else:
-                p1 = ranking_selection(population, costs)
-                p2 = ranking_selection(population, costs)
-            
+        for k in range(elitism, pop_size):
+            j = k - elitism
+            p1 = population[parent_idx[j]].tolist()
+            p2 = population[parent_idx[n_children + j]].tolist()
             if crossover_type == "ox":
                 child = order_crossover(p1, p2)
             elif crossover_type == "pmx":
@@ -226,67 +430,589 @@ def ga_adaptive_mutation(
             if random.random() < p_mut:
                 child = swap(child)
             
-            new_pop.append(child)
+            next_population[k] = child
         
-        population = new_pop[:pop_size]
+        population, next_population = next_population, population
+    
+    return best_route, tsp.route_length(best_route)
+
+
+def steady_state_ga(
+    tsp,
+    pop_size=100,
+    offspring=10000,
+    p_mut=0.1,
+    p_cross=0.9,
+    crossover_type="ox",
+    mutation_type="swap",
+    tournament_size=3,
+    use_nn_start=False,
+    stats=None
+):
+    """
+    USPRAWNIENIE: GA stacjonarny (steady-state) z eliminacją duplikatów
+    
+    W każdym kroku powstaje jedno dziecko (turniej -> krzyżowanie ->
+    mutacja). Zastępuje ono najgorszego osobnika tylko wtedy, gdy jest od
+    niego lepsze i nie ma identycznej trasy w populacji:
+    - najgorszy osobnik: kopiec (-koszt, slot) - O(log pop_size),
+    - obecność trasy: hasze Zobrista członków populacji - O(1) po haszu O(n).
+    Najlepsze osobniki nie giną (elityzm jest wbudowany), a klony elity
+    nie zapychają populacji.
+    
+    Args:
+        tsp: obiekt TSP
+        pop_size: wielkość populacji
+        offspring: liczba wygenerowanych dzieci (= liczba ocen po starcie)
+        p_mut: prawdopodobieństwo mutacji
+        p_cross: prawdopodobieństwo krzyżowania
+        crossover_type: metoda krzyżowania ("ox", "pmx", "cx", "erx", "eax")
+        mutation_type: typ mutacji ("swap", "insert", "inversion")
+        tournament_size: rozmiar turnieju
+        use_nn_start: czy zaszczepić populację rozwiązaniami NN
+        stats: opcjonalny słownik - evaluations, replacements, duplicates
+               (odrzucone klony), rejected (dzieci gorsze od najgorszego)
+    
+    Returns:
+        (best_route, best_dist)
+    """
+    n = tsp.n
+    dm = tsp.dist_matrix
+    crossover_funcs = _crossover_funcs(tsp)
+    cross_func = crossover_funcs.get(crossover_type, crossover_funcs["ox"])
+    mutation_move = {"swap": "swap", "insert": "insert", "inversion": "two_opt"}.get(mutation_type, "swap")
+    apply_move = APPLY_MOVE[mutation_move]
+    tournament_size = max(1, min(tournament_size, pop_size))
+    
+    population = _init_population(tsp, pop_size, use_nn_start)
+    costs = tsp.route_lengths(population).tolist()  # Lista - szybszy dostęp pojedynczy
+    slots = range(pop_size)
+    
+    # Hasze członków populacji (licznik - populacja startowa może mieć klony)
+    zobrist = ZobristHash(n)
+    hashes = zobrist.tour_hashes(population)
+    members = {}
+    for h in hashes:
+        members[h] = members.get(h, 0) + 1
+    
+    # Kopiec maksimum kosztów: każdy slot populacji występuje w nim dokładnie raz
+    worst_heap = [(-c, i) for i, c in enumerate(costs)]
+    heapq.heapify(worst_heap)
+    
+    best_idx = min(slots, key=costs.__getitem__)
+    best_route = population[best_idx].tolist()
+    best_dist = costs[best_idx]
+    
+    replacements = duplicates = rejected = 0
+    
+    for _ in range(offspring):
+        # --- KROK 1: Dziecko z dwóch rodziców wybranych turniejem ---
+        i1 = min(random.sample(slots, tournament_size), key=costs.__getitem__)
+        i2 = min(random.sample(slots, tournament_size), key=costs.__getitem__)
+        p1 = population[i1].tolist()
+        if random.random() < p_cross:
+            child = cross_func(p1, population[i2].tolist())
+        else:
+            child = p1
+        if n >= 2 and random.random() < p_mut:
+            apply_move(child, *sample_move(n, mutation_move))
+        
+        # --- KROK 2: Ocena i test przyjęcia ---
+        prev = child[-1]
+        child_cost = 0.0
+        for city in child:
+            child_cost += dm[prev][city]
+            prev = city
+        worst_cost, worst_slot = -worst_heap[0][0], worst_heap[0][1]
+        if child_cost >= worst_cost:
+            rejected += 1
+            continue
+        
+        child_hash = zobrist.tour_hash(child)
+        if child_hash in members:
+            duplicates += 1
+            continue
+        
+        # --- KROK 3: Zastąp najgorszego ---
+        old_hash = hashes[worst_slot]
+        if members[old_hash] == 1:
+            del members[old_hash]
+        else:
+            members[old_hash] -= 1
+        members[child_hash] = 1
+        hashes[worst_slot] = child_hash
+        population[worst_slot] = child
+        costs[worst_slot] = child_cost
+        heapq.heapreplace(worst_heap, (-child_cost, worst_slot))
+        replacements += 1
+        
+        if child_cost < best_dist:
+            best_dist = child_cost
+            best_route = child[:]
+    
+    if stats is not None:
+        stats.update({
+            'evaluations': pop_size + offspring,
+            'replacements': replacements,
+            'duplicates': duplicates,
+            'rejected': rejected
+        })
+    
+    return best_route, tsp.route_length(best_route)
+
+
+def island_genetic_algorithm(
+    tsp,
+    n_islands=4,
+    island_size=50,
+    generations=200,
+    migration_interval=20,
+    migration_size=2,
+    migration_policy="best-worst",
+    p_mut=0.1,
+    p_cross=0.9,
+    selection_type="tournament",
+    crossover_type="ox",
+    mutation_type="swap",
+    elitism=2,
+    parallel=True,
+    use_nn_start=False
+):
+    """
+    USPRAWNIENIE: GA z modelem wyspowym (island model)
+    
+    Każda wyspa to osobna populacja ewoluująca silnikiem genetic_algorithm
+    we własnym procesie. Co migration_interval generacji wyspa i wysyła
+    migration_size osobników (z kosztami) do wyspy i+1 (pierścień) przez
+    kolejkę i przyjmuje imigrantów od wyspy i-1. Wyspy ewoluują niezależnie,
+    więc różnorodność jest większa niż w jednej dużej populacji, a czas
+    skaluje się z liczbą rdzeni.
+    
+    Args:
+        tsp: obiekt TSP
+        n_islands: liczba wysp (procesów)
+        island_size: wielkość populacji jednej wyspy
+        generations: łączna liczba generacji każdej wyspy
+        migration_interval: liczba generacji między migracjami
+        migration_size: liczba migrantów wysyłanych przez wyspę
+        migration_policy: "emigranci-zastępowani":
+                          "best-worst" - najlepsi zastępują najgorszych,
+                          "best-random" - najlepsi zastępują losowych,
+                          "random-worst" - losowi zastępują najgorszych
+        p_mut, p_cross, selection_type, crossover_type, mutation_type, elitism:
+            jak w genetic_algorithm
+        parallel: czy uruchomić wyspy w osobnych procesach
+                  (False = kolejno w jednym procesie, ta sama semantyka)
+        use_nn_start: czy zaszczepić wyspy rozwiązaniami NN
+    
+    Returns:
+        (best_route, best_dist)
+    """
+    n_islands = max(1, n_islands)
+    migration_interval = max(1, migration_interval)
+    migration_size = max(0, min(migration_size, island_size - 1))
+    epochs = math.ceil(generations / migration_interval) if generations > 0 else 0
+    settings = {
+        'p_mut': p_mut,
+        'p_cross': p_cross,
+        'selection_type': selection_type,
+        'crossover_type': crossover_type,
+        'mutation_type': mutation_type,
+        'elitism': elitism,
+        'zobrist': ZobristHash(tsp.n)  # Wspólne klucze dla wszystkich wysp i epok
+    }
+    
+    # Populacje startowe (tylko pierwsza wyspa dostaje trasy NN)
+    populations = [_init_population(tsp, island_size, use_nn_start and i == 0)
+                   for i in range(n_islands)]
+    seeds = [random.getrandbits(64) for _ in range(n_islands)]
+    plan = (generations, epochs, migration_interval, migration_size, migration_policy)
+    
+    if parallel and n_islands > 1:
+        results = _run_islands_parallel(tsp, populations, seeds, settings, plan)
+    else:
+        results = _run_islands_sequential(tsp, populations, seeds, settings, plan)
+    
+    best_route, best_dist = min(results, key=lambda r: r[1])
+    return best_route, tsp.route_length(best_route)
+
+
+def _epoch_generations(epoch, generations, migration_interval):
+    """Liczba generacji w danej epoce (ostatnia może być krótsza)."""
+    return min(migration_interval, generations - epoch * migration_interval)
+
+
+def _run_islands_sequential(tsp, populations, seeds, settings, plan):
+    """
+    Wyspy po kolei w jednym procesie - migracja synchroniczna po każdej
+    epoce, jak w wersji wieloprocesowej.
+    """
+    generations, epochs, migration_interval, migration_size, policy = plan
+    k = len(populations)
+    rngs = [random.Random(seed) for seed in seeds]
+    costs = [tsp.route_lengths(pop) for pop in populations]
+    bests = [_best_of(pop, c) for pop, c in zip(populations, costs)]
+    
+    for epoch in range(epochs):
+        gens = _epoch_generations(epoch, generations, migration_interval)
+        for i in range(k):
+            # Każda wyspa z własnym strumieniem liczb losowych
+            random.setstate(rngs[i].getstate())
+            populations[i], costs[i], route, dist = _evolve(
+                tsp, populations[i], costs[i], gens, **settings)
+            rngs[i].setstate(random.getstate())
+            if dist < bests[i][1]:
+                bests[i] = (route, dist)
+        
+        if epoch < epochs - 1 and migration_size > 0:
+            outgoing = [_select_emigrants(populations[i], costs[i], migration_size, policy)
+                        for i in range(k)]
+            for i in range(k):
+                _accept_immigrants(populations[i], costs[i], outgoing[i - 1], policy)
+    
+    return bests
+
+
+def _run_islands_parallel(tsp, populations, seeds, settings, plan):
+    """
+    Każda wyspa w osobnym procesie; pierścień kolejek: wyspa i pisze do
+    inboxes[i+1] i czyta z inboxes[i]. Kolejki buforują dane w wątku
+    zasilającym, więc jednoczesne wysyłanie nie blokuje wysp.
+    """
+    k = len(populations)
+    inboxes = [Queue() for _ in range(k)]
+    results_queue = Queue()
+    workers = [
+        Process(target=_island_worker,
+                args=(i, tsp, populations[i], seeds[i], settings, plan,
+                      inboxes[i], inboxes[(i + 1) % k], results_queue))
+        for i in range(k)
+    ]
+    for worker in workers:
+        worker.start()
+    
+    results = {}
+    try:
+        while len(results) < k:
+            try:
+                i, route, dist = results_queue.get(timeout=1.0)
+                results[i] = (route, dist)
+            except Empty:
+                # Wyspa zakończona błędem nie odeśle wyniku - nie czekaj w nieskończoność
+                if any(w.exitcode not in (None, 0) for w in workers):
+                    raise RuntimeError("Proces wyspy GA zakończył się błędem")
+    finally:
+        for worker in workers:
+            if results.keys() != set(range(k)):
+                worker.terminate()
+            worker.join()
+    
+    return [results[i] for i in range(k)]
+
+
+def _island_worker(island_id, tsp, population, seed, settings, plan, inbox, outbox, results_queue):
+    """Proces wyspy: epoki ewolucji przeplatane migracją po pierścieniu."""
+    generations, epochs, migration_interval, migration_size, policy = plan
+    random.seed(seed)  # Po fork procesy mają ten sam stan generatora
+    costs = tsp.route_lengths(population)
+    best_route, best_dist = _best_of(population, costs)
+    
+    for epoch in range(epochs):
+        gens = _epoch_generations(epoch, generations, migration_interval)
+        population, costs, route, dist = _evolve(tsp, population, costs, gens, **settings)
+        if dist < best_dist:
+            best_route, best_dist = route, dist
+        
+        if epoch < epochs - 1 and migration_size > 0:
+            outbox.put(_select_emigrants(population, costs, migration_size, policy))
+            _accept_immigrants(population, costs, inbox.get(), policy)
+    
+    results_queue.put((island_id, best_route, best_dist))
+
+
+def _best_of(population, costs):
+    """(trasa, koszt) najlepszego osobnika populacji."""
+    i = int(np.argmin(costs))
+    return population[i].tolist(), float(costs[i])
+
+
+def _select_emigrants(population, costs, m, policy):
+    """Kopie m osobników wysyłanych na sąsiednią wyspę (z kosztami)."""
+    if policy.startswith("random"):
+        idx = np.array(random.sample(range(len(costs)), m), dtype=np.int64)
+    else:
+        idx = _elite_indices(costs, m)
+    return population[idx].copy(), costs[idx].copy()
+
+
+def _accept_immigrants(population, costs, migrants, policy):
+    """
+    Wstawia imigrantów w miejscu: zastępuje najgorszych ("-worst")
+    albo losowych osobników poza najlepszym ("-random").
+    """
+    routes, route_costs = migrants
+    m = len(route_costs)
+    if m == 0:
+        return
+    if policy.endswith("random"):
+        best = int(np.argmin(costs))
+        candidates = [i for i in range(len(costs)) if i != best]
+        idx = np.array(random.sample(candidates, m), dtype=np.int64)
+    else:
+        idx = np.argpartition(costs, len(costs) - m)[len(costs) - m:]
+    population[idx] = routes
+    costs[idx] = route_costs
+
+
+def _crossover_funcs(tsp):
+    """Słownik krzyżowań pojedynczych: nazwa -> funkcja(p1, p2) -> dziecko."""
+    return {
+        "ox": order_crossover,
+        "pmx": pmx_crossover,
+        "cx": cycle_crossover,
+        "erx": edge_recombination_crossover,
+        "eax": lambda p1, p2: eax_crossover(p1, p2, tsp.dist_matrix, tsp.neighbor_lists(10))
+    }
+
+
+def _init_population(tsp, pop_size, use_nn_start=False):
+    """
+    Tworzy populację początkową jako tablicę NumPy (pop_size x n).
+    
+    USPRAWNIENIE (use_nn_start): pierwsze wiersze to trasy NN
+    z różnych miast startowych, reszta to losowe permutacje.
+    """
+    n = tsp.n
+    population = np.empty((pop_size, n), dtype=np.int64)
+    
+    seeded = 0
+    if use_nn_start:
+        from algorithms.nn import nearest_neighbor
+        for start in range(min(5, n, pop_size)):
+            nn_route, _ = nearest_neighbor(tsp, start=start)
+            population[seeded] = nn_route
+            seeded += 1
     
-    return best_route, best_dist
+    # Reszta populacji losowa - argsort losowych kluczy daje permutacje wierszy
+    rng = np.random.default_rng(random.getrandbits(64))
+    population[seeded:] = np.argsort(rng.random((pop_size - seeded, n)), axis=1)
+    return population
 
 
-def _calculate_diversity(population):
+def _elite_indices(costs, k):
     """
-    Oblicza różnorodność populacji jako procent unikalnych krawędzi.
+    Indeksy k najlepszych osobników (rosnąco po koszcie).
+    argpartition wybiera k najmniejszych w O(pop_size), sortujemy tylko je.
+    """
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    if k >= len(costs):
+        return np.argsort(costs)
+    top = np.argpartition(costs, k - 1)[:k]
+    return top[np.argsort(costs[top])]
+
+
+# Sąsiedztwa przeszukiwania lokalnego w trybie memetycznym
+# (Or-opt z segmentem długości 1 = ruch insert)
+LOCAL_SEARCH_MOVES = {
+    "two_opt": ("two_opt",),
+    "or_opt": ("insert",),
+    "both": ("two_opt", "insert")
+}
+
+# Tolerancja na błędy zaokrągleń przy ocenie ruchów
+EPS = 1e-9
+
+
+def _local_search(route, dm, neighbors, moves, budget):
+    """
+    Ograniczone przeszukiwanie lokalne (first-improvement, w miejscu).
+    
+    Dla każdego miasta c i kandydata c2 z listy najbliższych sąsiadów:
+    - two_opt: odwrócenie fragmentu tak, by c i c2 stały się sąsiadami,
+    - insert: przeniesienie c2 tuż za c (Or-opt jednego miasta).
+    Ruchy oceniane deltą O(1) z neighborhoods.py; przerywamy po `budget`
+    ocenionych ruchach albo w minimum lokalnym.
+    
+    Returns:
+        (zmiana_kosztu, liczba_ocenionych_ruchów)
+    """
+    n = len(route)
+    pos = [0] * n
+    for i, city in enumerate(route):
+        pos[city] = i
+    
+    total = 0.0
+    used = 0
+    improved = True
+    while improved and used < budget:
+        improved = False
+        for c in range(n):
+            for c2 in neighbors[c]:
+                i, j = pos[c], pos[c2]
+                for move in moves:
+                    if move == "two_opt":
+                        a, b = min(i, j) + 1, max(i, j) + 1
+                    else:
+                        a, b = j, (i + 1 if j > i else i)
+                        if a == b:
+                            continue
+                    delta = MOVE_DELTA[move](route, dm, a, b)
+                    used += 1
+                    if delta < -EPS:
+                        APPLY_MOVE[move](route, a, b)
+                        total += delta
+                        lo, hi = min(a, b), max(a, b)
+                        for p in range(lo, min(hi + 1, n)):  # Zmienione pozycje
+                            pos[route[p]] = p
+                        improved = True
+                        break
+                    if used >= budget:
+                        return total, used
+    
+    return total, used
+
+
+def _cache_store(cache, keys, values, max_size):
+    """
+    Zapisuje koszty w pamięci hasz -> koszt; po przekroczeniu max_size
+    usuwa najstarsze wpisy (słownik zachowuje kolejność wstawiania).
+    """
+    if max_size <= 0:
+        return
+    for h, c in zip(keys, values):
+        cache[h] = c
+    while len(cache) > max_size:
+        del cache[next(iter(cache))]
+
+
+def _population_diversity(population, rng=None, sample_pairs=32):
     """
-    if not population:
-        return 0.0
+    Miary różnorodności populacji liczone wektorowo z macierzy zliczeń
+    krawędzi (np.bincount po identyfikatorach krawędzi min*n + max)
+    zamiast zbioru krotek budowanego w pętli.
     
-    n = len(population[0])
-    all_edges = set()
+    Returns:
+        dict z wartościami w [0, 1]:
+        - edges: udział unikalnych krawędzi wśród wszystkich możliwych
+        - entropy: entropia częstości krawędzi, 0 = wszyscy identyczni,
+          1 = żadna krawędź się nie powtarza
+        - pairwise: średni udział różnych krawędzi w sample_pairs
+          losowych parach osobników
+    """
+    pop_size, n = population.shape
+    if pop_size == 0 or n < 2:
+        return {'edges': 0.0, 'entropy': 0.0, 'pairwise': 0.0}
     
-    for ind in population:
-        for i in range(n):
-            edge = (min(ind[i], ind[(i+1) % n]), max(ind[i], ind[(i+1) % n]))
-            all_edges.add(edge)
+    # Identyfikatory krawędzi nieskierowanych
+    nxt = np.roll(population, -1, axis=1)
+    edge_ids = np.minimum(population, nxt) * n + np.maximum(population, nxt)
+    counts = np.bincount(edge_ids.ravel(), minlength=n * n)
+    counts = counts[counts > 0]
     
-    # Maksymalna możliwa liczba krawędzi
     max_edges = n * (n - 1) // 2
+    edges = len(counts) / max_edges if max_edges > 0 else 0.0
+    
+    # Entropia znormalizowana: log(n) gdy wszyscy identyczni, log(pop*n) gdy
+    # każda krawędź jest inna
+    freq = counts / counts.sum()
+    entropy = -float(np.sum(freq * np.log(freq)))
+    entropy = (entropy - np.log(n)) / np.log(pop_size) if pop_size > 1 else 0.0
+    
+    # Odległość krawędziowa par: posortowane krawędzie obu osobników,
+    # wspólne krawędzie to sąsiednie równe wartości
+    pairwise = 0.0
+    if pop_size > 1 and sample_pairs > 0:
+        rng = rng if rng is not None else np.random.default_rng()
+        first = rng.integers(0, pop_size, sample_pairs)
+        second = (first + rng.integers(1, pop_size, sample_pairs)) % pop_size
+        merged = np.sort(np.concatenate([edge_ids[first], edge_ids[second]], axis=1), axis=1)
+        shared = np.count_nonzero(merged[:, 1:] == merged[:, :-1], axis=1)
+        pairwise = float(np.mean(1 - shared / n))
     
-    return len(all_edges) / max_edges if max_edges > 0 else 0.0
+    return {'edges': edges, 'entropy': min(1.0, max(0.0, float(entropy))), 'pairwise': pairwise}
 
 
 # --- METODY SELEKCJI ---
 
+def _copy_individual(ind):
+    """Niezależna kopia osobnika (wycinek [:] tablicy NumPy to tylko widok)."""
+    return ind.copy() if isinstance(ind, np.ndarray) else ind[:]
+
+
 def tournament_selection(pop, costs, k=3):
     """Selekcja turniejowa: wybiera najlepszego z k losowych osobników."""
-    idx = random.sample(range(len(pop)), min(k, len(pop)))
-    winner = min(idx, key=lambda i: costs[i])
-    return pop[winner][:]
+    return _copy_individual(pop[_tournament_indices(np.asarray(costs), 1, _numpy_rng(), k)[0]])
 
 
 def roulette_selection(pop, costs):
     """Selekcja ruletkowa: prawdopodobieństwo proporcjonalne do fitness."""
-    max_c = max(costs)
-    fitness = [max_c - c + 1 for c in costs]  # +1 aby uniknąć zerowych wartości
-    total = sum(fitness)
-    probs = [f / total for f in fitness]
-    chosen = random.choices(pop, weights=probs, k=1)[0]
-    return chosen[:]
+    return _copy_individual(pop[_roulette_indices(np.asarray(costs), 1, _numpy_rng())[0]])
 
 
 def ranking_selection(pop, costs):
     """Selekcja rankingowa: prawdopodobieństwo proporcjonalne do rangi."""
-    n = len(pop)
-    # Sortuj indeksy od najgorszego (najwyższy koszt) do najlepszego
-    sorted_indices = sorted(range(n), key=lambda k: costs[k], reverse=True)
-    # Rangi: najgorszy ma rangę 1, najlepszy ma rangę n
-    ranks = list(range(1, n + 1))
-    total_ranks = sum(ranks)
-    probs = [r / total_ranks for r in ranks]
-    chosen_idx = random.choices(sorted_indices, weights=probs, k=1)[0]
-    return pop[chosen_idx][:]
+    return _copy_individual(pop[_ranking_indices(np.asarray(costs), 1, _numpy_rng())[0]])
+
+
+# Wersje wsadowe: koszty są stałe w obrębie generacji, więc strukturę
+# losowania budujemy raz i losujemy od razu `count` indeksów rodziców
+# (O(pop_size + count) zamiast O(pop_size) na każdego rodzica).
+# Kopiowanie osobników odkładane jest do krzyżowania.
+
+def _numpy_rng():
+    """Generator NumPy zasilany z modułu random (powtarzalność przez random.seed)."""
+    return np.random.default_rng(random.getrandbits(64))
+
+
+def _tournament_indices(costs, count, rng, k=3):
+    """Turnieje k osobników (bez powtórzeń w turnieju) - zwycięzcy."""
+    pop_size = len(costs)
+    k = min(k, pop_size)
+    
+    if 4 * k > pop_size:
+        # Duże k względem populacji: ponowne losowanie prawie zawsze trafiałoby
+        # na powtórzenie - bierzemy k pierwszych z losowej permutacji każdego wiersza
+        contestants = np.argsort(rng.random((count, pop_size)), axis=1)[:, :k]
+        winners = np.argmin(costs[contestants], axis=1)
+        return contestants[np.arange(count), winners]
+    
+    contestants = rng.integers(0, pop_size, (count, k))
+    
+    # Turnieje z powtórzonym osobnikiem losujemy ponownie (rzadkie dla k << pop)
+    if k > 1:
+        ordered = np.sort(contestants, axis=1)
+        repeated = np.flatnonzero((ordered[:, 1:] == ordered[:, :-1]).any(axis=1))
+        while len(repeated):
+            redraw = rng.integers(0, pop_size, (len(repeated), k))
+            contestants[repeated] = redraw
+            ordered = np.sort(redraw, axis=1)
+            repeated = repeated[(ordered[:, 1:] == ordered[:, :-1]).any(axis=1)]
+    
+    winners = np.argmin(costs[contestants], axis=1)
+    return contestants[np.arange(count), winners]
+
+
+def _roulette_indices(costs, count, rng):
+    """Ruletka: dystrybuanta wag (max_c - c + 1) liczona raz, wyszukiwanie binarne."""
+    fitness = costs.max() - costs + 1  # +1 aby uniknąć zerowych wartości
+    cumulative = np.cumsum(fitness)
+    picks = np.searchsorted(cumulative, rng.random(count) * cumulative[-1], side='right')
+    return np.minimum(picks, len(costs) - 1)
+
+
+def _ranking_indices(costs, count, rng):
+    """Ranking: jedno sortowanie na generację; najgorszy ma rangę 1, najlepszy n."""
+    pop_size = len(costs)
+    worst_first = np.argsort(-costs, kind='stable')
+    cumulative = np.cumsum(np.arange(1, pop_size + 1))
+    picks = np.searchsorted(cumulative, rng.random(count) * cumulative[-1], side='right')
+    return worst_first[np.minimum(picks, pop_size - 1)]
 
 
 # --- METODY KRZYŻOWANIA ---
+# Wszystkie działają w O(n): przynależność do segmentu sprawdzana przez
+# maskę indeksowaną miastem, pozycje miast przez tablicę odwrotną.
 
 def order_crossover(p1, p2):
     """
@@ -297,19 +1023,16 @@ def order_crossover(p1, p2):
         return p1[:]
     
     a, b = sorted(random.sample(range(size), 2))
-    child = [None] * size
-    child[a:b] = p1[a:b]
     
-    # Elementy z P2 które nie są w skopiowanym segmencie
-    p2_remaining = [x for x in p2 if x not in child[a:b]]
+    # Maska miast z segmentu P1
+    in_segment = [False] * size
+    for city in p1[a:b]:
+        in_segment[city] = True
     
-    cursor = 0
-    for i in range(size):
-        if child[i] is None:
-            child[i] = p2_remaining[cursor]
-            cursor += 1
+    # Elementy z P2 które nie są w skopiowanym segmencie (kolejność z P2)
+    p2_remaining = [x for x in p2 if not in_segment[x]]
     
-    return child
+    return p2_remaining[:a] + p1[a:b] + p2_remaining[a:]
 
 
 def pmx_crossover(p1, p2):
@@ -324,14 +1047,20 @@ def pmx_crossover(p1, p2):
     child = [None] * size
     child[a:b] = p1[a:b]
     
-    # Mapowanie
+    # Pozycje miast w P2 i maska miast z segmentu P1
+    pos2 = [0] * size
+    for i, city in enumerate(p2):
+        pos2[city] = i
+    in_segment = [False] * size
+    for city in p1[a:b]:
+        in_segment[city] = True
+    
+    # Mapowanie - łańcuchy są rozłączne, więc łącznie O(n) kroków
     for i in range(a, b):
-        if p2[i] not in child[a:b]:
-            curr = p1[i]
-            idx = p2.index(curr)
+        if not in_segment[p2[i]]:
+            idx = pos2[p1[i]]
             while a <= idx < b:
-                curr = p1[idx]
-                idx = p2.index(curr)
+                idx = pos2[p1[idx]]
             child[idx] = p2[i]
     
     # Uzupełnij pozostałe
@@ -348,26 +1077,356 @@ def cycle_crossover(p1, p2):
     """
     size = len(p1)
     child = [None] * size
-    cycle = 0
     
-    while None in child:
-        idx = child.index(None)
-        start_val = p1[idx]
+    # Pozycje miast w P1
+    pos1 = [0] * size
+    for i, city in enumerate(p1):
+        pos1[city] = i
+    
+    cycle = 0
+    for start in range(size):  # Cykle w kolejności pierwszej wolnej pozycji
+        if child[start] is not None:
+            continue
         
         # Śledź cykl
+        parent = p1 if cycle % 2 == 0 else p2
+        idx = start
         while child[idx] is None:
-            if cycle % 2 == 0:
-                child[idx] = p1[idx]
-            else:
-                child[idx] = p2[idx]
-            
-            # Znajdź pozycję wartości z P2 w P1
-            val_from_p2 = p2[idx]
-            if val_from_p2 in p1:
-                idx = p1.index(val_from_p2)
-            else:
-                break
+            child[idx] = parent[idx]
+            idx = pos1[p2[idx]]  # Pozycja wartości z P2 w P1
         
         cycle += 1
     
-    return child
\ No newline at end of file
+    return child
+
+
+# --- KRZYŻOWANIA KRAWĘDZIOWE ---
+# OX / PMX / CX dziedziczą pozycje miast, a dla TSP liczą się krawędzie.
+# ERX i EAX budują dziecko niemal wyłącznie z krawędzi rodziców.
+
+def edge_recombination_crossover(p1, p2):
+    """
+    Edge Recombination Crossover (ERX).
+    
+    Tablica sąsiedztwa: dla każdego miasta sąsiedzi w P1 i P2 (maks. 4).
+    Z aktualnego miasta idziemy do sąsiada o najmniejszej liczbie pozostałych
+    sąsiadów (remisy losowo); gdy brak sąsiadów - do losowego wolnego miasta.
+    Krok kosztuje O(1), całość O(n).
+    """
+    size = len(p1)
+    adjacency = [[] for _ in range(size)]
+    for parent in (p1, p2):
+        prev = parent[-1]
+        for city in parent:
+            if city not in adjacency[prev]:
+                adjacency[prev].append(city)
+                adjacency[city].append(prev)
+            prev = city
+    
+    # Wolne miasta: lista + pozycje (usuwanie przez zamianę z ostatnim)
+    free = list(range(size))
+    free_pos = list(range(size))
+    
+    child = []
+    current = p1[0]
+    while True:
+        child.append(current)
+        last = free.pop()
+        if last != current:
+            free[free_pos[current]] = last
+            free_pos[last] = free_pos[current]
+        if not free:
+            break
+        
+        # Usuń miasto z list sąsiadów (listy są symetryczne)
+        for neighbor in adjacency[current]:
+            adjacency[neighbor].remove(current)
+        
+        candidates = adjacency[current]
+        if candidates:
+            fewest = min(len(adjacency[c]) for c in candidates)
+            current = random.choice([c for c in candidates if len(adjacency[c]) == fewest])
+        else:
+            current = random.choice(free)
+    
+    return child
+
+
+def eax_crossover(p1, p2, dm, neighbors):
+    """
+    Edge Assembly Crossover (EAX), strategia pojedyncza (jeden AB-cykl).
+    
+    1. AB-cykl: naprzemiennie krawędzie tylko z P1 (A) i tylko z P2 (B),
+       znaleziony losowym spacerem po różnicy krawędzi rodziców.
+    2. Dziecko pośrednie: krawędzie A, z których usuwamy krawędzie A cyklu
+       i dodajemy jego krawędzie B - każde miasto ma nadal stopień 2, ale
+       powstają podcykle.
+    3. Podcykle scalane zachłannie od najmniejszego: usuwamy krawędź (u, v)
+       podcyklu i (w, x) innego, dodajemy tańszą z par (u, w)+(v, x)
+       lub (u, x)+(v, w); w szukamy wśród najbliższych sąsiadów u.
+    
+    Args:
+        p1, p2: trasy rodziców (listy)
+        dm: macierz odległości
+        neighbors: listy kandydatów (tsp.neighbor_lists)
+    """
+    size = len(p1)
+    if size < 5:
+        return p1[:]
+    
+    adj_a = _tour_adjacency(p1)
+    adj_b = _tour_adjacency(p2)
+    
+    # Krawędzie występujące tylko w jednym z rodziców
+    only_a = [[c for c in adj_a[v] if c not in adj_b[v]] for v in range(size)]
+    only_b = [[c for c in adj_b[v] if c not in adj_a[v]] for v in range(size)]
+    starts = [v for v in range(size) if only_a[v]]
+    if not starts:
+        return p1[:]  # Rodzice to ta sama trasa
+    
+    cycle, first_type = _ab_cycle(only_a, only_b, random.choice(starts))
+    
+    # --- Dziecko pośrednie: A - (A z cyklu) + (B z cyklu) ---
+    child_adj = [list(pair) for pair in adj_a]
+    for j in range(len(cycle) - 1):
+        u, v = cycle[j], cycle[j + 1]
+        if (first_type + j) % 2 == 0:  # Krawędź A - usuń
+            child_adj[u].remove(v)
+            child_adj[v].remove(u)
+        else:  # Krawędź B - dodaj
+            child_adj[u].append(v)
+            child_adj[v].append(u)
+    
+    # --- Podcykle: etykiety składowych ---
+    component = [-1] * size
+    members = []
+    for start in range(size):
+        if component[start] < 0:
+            label = len(members)
+            cities = _walk_cycle(child_adj, start)
+            for city in cities:
+                component[city] = label
+            members.append(cities)
+    
+    # --- Scalanie podcykli (najmniejszy z najtańszym sąsiednim) ---
+    alive = set(range(len(members)))
+    while len(alive) > 1:
+        small = min(alive, key=lambda c: len(members[c]))
+        best = _best_merge(child_adj, component, members[small], dm, neighbors)
+        if best is None:
+            best = _best_merge(child_adj, component, members[small], dm, None)
+        
+        _, u, v, w, x, cross = best
+        child_adj[u].remove(v)
+        child_adj[v].remove(u)
+        child_adj[w].remove(x)
+        child_adj[x].remove(w)
+        if cross:
+            child_adj[u].append(x); child_adj[x].append(u)
+            child_adj[v].append(w); child_adj[w].append(v)
+        else:
+            child_adj[u].append(w); child_adj[w].append(u)
+            child_adj[v].append(x); child_adj[x].append(v)
+        
+        target = component[w]
+        for city in members[small]:
+            component[city] = target
+        members[target].extend(members[small])
+        alive.discard(small)
+    
+    return _walk_cycle(child_adj, p1[0])
+
+
+def _tour_adjacency(route):
+    """Sąsiedzi każdego miasta w trasie: adjacency[c] = (poprzednik, następnik)."""
+    size = len(route)
+    adjacency = [None] * size
+    prev = route[-1]
+    for i, city in enumerate(route):
+        adjacency[city] = (prev, route[(i + 1) % size])
+        prev = city
+    return adjacency
+
+
+def _ab_cycle(only_a, only_b, start):
+    """
+    Losowy spacer naprzemiennie po krawędziach A i B (zużywając je) aż do
+    powrotu do miasta, z którego kolejną krawędzią byłby ten sam typ -
+    wycinek spaceru jest wtedy AB-cyklem.
+    
+    Returns:
+        (miasta cyklu z powtórzonym pierwszym na końcu, typ pierwszej krawędzi: 0=A, 1=B)
+    """
+    path = [start]
+    seen = {(start, 0): 0}
+    current, edge_type = start, 0
+    while True:
+        edges = only_a if edge_type == 0 else only_b
+        nxt = random.choice(edges[current])
+        edges[current].remove(nxt)
+        edges[nxt].remove(current)
+        path.append(nxt)
+        current, edge_type = nxt, 1 - edge_type
+        key = (current, edge_type)
+        if key in seen:
+            i = seen[key]
+            return path[i:], i % 2
+        seen[key] = len(path) - 1
+
+
+def _walk_cycle(adjacency, start):
+    """Miasta cyklu zawierającego start, w kolejności obchodzenia."""
+    cities = [start]
+    prev, current = start, adjacency[start][0]
+    while current != start:
+        cities.append(current)
+        a, b = adjacency[current]
+        prev, current = current, (b if a == prev else a)
+    return cities
+
+
+def _best_merge(child_adj, component, cities, dm, neighbors):
+    """
+    Najtańsze połączenie podcyklu `cities` z innym podcyklem.
+    neighbors=None oznacza pełny przegląd (gdy listy kandydatów nie
+    sięgają poza podcykl).
+    
+    Returns:
+        (koszt, u, v, w, x, skrzyżowane) lub None
+    """
+    label = component[cities[0]]
+    size = len(component)
+    best = None
+    for u in cities:
+        candidates = neighbors[u] if neighbors is not None else range(size)
+        for w in candidates:
+            if component[w] == label:
+                continue
+            for v in child_adj[u]:
+                d_uv = dm[u][v]
+                for x in child_adj[w]:
+                    removed = d_uv + dm[w][x]
+                    straight = dm[u][w] + dm[v][x] - removed
+                    crossed = dm[u][x] + dm[v][w] - removed
+                    if best is None or straight < best[0]:
+                        best = (straight, u, v, w, x, False)
+                    if crossed < best[0]:
+                        best = (crossed, u, v, w, x, True)
+    return best
+
+
+# --- KRZYŻOWANIE WSADOWE (NumPy) ---
+# Cała generacja naraz: parents1, parents2 to tablice (m x n), wiersz k
+# to para rodziców k-tego dziecka. Wynik zgodny z wersjami pojedynczymi
+# dla tych samych punktów cięcia.
+
+def _cut_points(rng, m, n):
+    """Pary punktów cięcia a < b (jak sorted(random.sample(range(n), 2)))."""
+    a = rng.integers(0, n, m)
+    b = rng.integers(0, n - 1, m)
+    b += b >= a
+    return np.minimum(a, b), np.maximum(a, b)
+
+
+def _segment_masks(parents1, a, b):
+    """
+    Maska pozycji segmentu [a, b) oraz maska miast z segmentu P1
+    (indeksowana miastem) dla każdego wiersza.
+    """
+    m, n = parents1.shape
+    positions = np.arange(n)
+    in_segment = (positions >= a[:, None]) & (positions < b[:, None])
+    city_in_segment = np.empty((m, n), dtype=bool)
+    np.put_along_axis(city_in_segment, parents1, in_segment, axis=1)
+    return in_segment, city_in_segment
+
+
+def order_crossover_batch(parents1, parents2, rng, out=None):
+    """
+    Wsadowy OX: segment z P1, reszta miast w kolejności z P2.
+    """
+    m, n = parents1.shape
+    children = np.empty_like(parents1) if out is None else out
+    if n < 2:
+        children[:] = parents1
+        return children
+    
+    a, b = _cut_points(rng, m, n)
+    in_segment, city_in_segment = _segment_masks(parents1, a, b)
+    keep = ~np.take_along_axis(city_in_segment, parents2, axis=1)
+    
+    # W każdym wierszu liczba pozostałych miast = liczba wolnych pozycji,
+    # więc spłaszczenie wierszami dopasowuje je we właściwej kolejności
+    children[in_segment] = parents1[in_segment]
+    children[~in_segment] = parents2[keep]
+    return children
+
+
+def pmx_crossover_batch(parents1, parents2, rng, out=None):
+    """
+    Wsadowy PMX: poza segmentem geny z P2, a konflikty (miasta z segmentu P1)
+    zastępowane mapowaniem P1[k] -> P2[k] aż do miasta spoza segmentu.
+    Łańcuchy mapowania skracane przez podwajanie wskaźników (log n kroków).
+    """
+    m, n = parents1.shape
+    children = np.empty_like(parents1) if out is None else out
+    if n < 2:
+        children[:] = parents1
+        return children
+    
+    a, b = _cut_points(rng, m, n)
+    in_segment, city_in_segment = _segment_masks(parents1, a, b)
+    offsets = (np.arange(m) * n)[:, None]
+    
+    # mapping[v] = P2[pos1[v]] dla miast z segmentu P1, dla pozostałych v
+    # (punkty stałe - koniec łańcucha)
+    pos1 = np.empty_like(parents1)
+    np.put_along_axis(pos1, parents1, np.broadcast_to(np.arange(n), (m, n)), axis=1)
+    mapping = np.where(city_in_segment, parents2.ravel()[pos1 + offsets], np.arange(n))
+    
+    flat = mapping + offsets  # Indeksy płaskie: szybszy gather niż take_along_axis
+    step = 1
+    while step < n:
+        flat = flat.ravel()[flat]
+        step *= 2
+    mapping = flat - offsets
+    
+    resolved = mapping.ravel()[parents2 + offsets]
+    children[:] = np.where(in_segment, parents1, resolved)
+    return children
+
+
+def cycle_crossover_batch(parents1, parents2, rng=None, out=None):
+    """
+    Wsadowy CX: cykle permutacji i -> pos1[p2[i]] etykietowane najmniejszą
+    pozycją w cyklu przez podwajanie wskaźników (O(n log n) na wiersz),
+    cykle na przemian z P1 i P2 w kolejności etykiet.
+    """
+    m, n = parents1.shape
+    children = np.empty_like(parents1) if out is None else out
+    offsets = (np.arange(m) * n)[:, None]
+    
+    positions = np.broadcast_to(np.arange(n), (m, n))
+    pos1 = np.empty_like(parents1)
+    np.put_along_axis(pos1, parents1, positions, axis=1)
+    
+    succ = pos1.ravel()[parents2 + offsets] + offsets  # Następnik w cyklu (płasko)
+    label = positions.copy()
+    step = 1
+    while step < n:
+        label = np.minimum(label, label.ravel()[succ])
+        succ = succ.ravel()[succ]
+        step *= 2
+    
+    # Numer cyklu = liczba cykli o mniejszej etykiecie
+    cycle_number = np.cumsum(label == positions, axis=1) - 1
+    parity = cycle_number.ravel()[label + offsets] % 2
+    children[:] = np.where(parity == 0, parents1, parents2)
+    return children
+
+
+BATCH_CROSSOVERS = {
+    "ox": order_crossover_batch,
+    "pmx": pmx_crossover_batch,
+    "cx": cycle_crossover_batch
+}
@@ -10,7 +10,9 @@ Parametry:
 - no_improve_limit: limit iteracji bez poprawy (opcjonalne kryterium stopu)
 """
 import random
+import time
 from utils.neighborhoods import NEIGHBORHOODS_DELTA, NEIGHBORHOODS
+from algorithms.vnd import variable_neighborhood_descent
 
 
 def iterative_hill_climbing(
@@ -19,7 +21,8 @@ def iterative_hill_climbing(
     restarts=20,
     neighborhood="two_opt",
     no_improve_limit=None,
-    use_nn_start=False
+    use_nn_start=False,
+    time_limit=None
 ):
     """
     Iteracyjna wspinaczka z multistartem (IHC)
@@ -31,6 +34,7 @@ def iterative_hill_climbing(
         neighborhood: typ sąsiedztwa ("swap", "insert", "two_opt")
         no_improve_limit: limit iteracji bez poprawy (None = brak limitu)
         use_nn_start: czy używać rozwiązania NN jako startowego (USPRAWNIENIE 1)
+        time_limit: limit czasu w sekundach (None = brak); przerywa restarty
     
     Returns:
         (best_route, best_length)
@@ -45,8 +49,12 @@ def iterative_hill_climbing(
     else:
         neigh_delta_func = NEIGHBORHOODS_DELTA["two_opt"]
     
+    deadline = time.perf_counter() + time_limit if time_limit is not None else None
+    
     # === PĘTLA GŁÓWNA: Wykonaj wiele restartów (multistart) ===
     for restart in range(restarts):
+        if deadline is not None and time.perf_counter() > deadline:
+            break  # Wyczerpany budżet czasu
         
         # --- KROK 1: Generowanie trasy startowej ---
         if use_nn_start and restart == 0:
@@ -93,7 +101,9 @@ def ihc_with_intensification(
     iterations=5000,
     restarts=20,
     neighborhood="two_opt",
-    intensification_threshold=0.01
+    intensification_threshold=0.01,
+    intensification="vnd",
+    time_limit=None
 ):
     """
     USPRAWNIENIE AUTORSKIE: IHC z intensyfikacją
@@ -101,12 +111,19 @@ def ihc_with_intensification(
     Gdy znajdziemy dobre rozwiązanie, intensyfikujemy przeszukiwanie
     w jego okolicy używając wszystkich trzech typów sąsiedztwa.
     
+    Domyślnie intensyfikacją jest VND (wyczerpujący przegląd swap, insert
+    i two_opt z oceną O(1), aż do wspólnego minimum lokalnego). Stara wersja
+    (iterations // 3 losowych prób na sąsiedztwo) jest dostępna jako
+    intensification="random" - do porównań.
+    
     Args:
         tsp: obiekt TSP
         iterations: liczba iteracji
         restarts: liczba restartów
         neighborhood: główny typ sąsiedztwa
         intensification_threshold: próg poprawy do intensyfikacji (%)
+        intensification: "vnd" lub "random" (losowe próbkowanie)
+        time_limit: limit czasu w sekundach (None = brak); przerywa restarty
     
     Returns:
         (best_route, best_length)
@@ -116,8 +133,12 @@ def ihc_with_intensification(
     n = tsp.n
     
     neigh_delta_func = NEIGHBORHOODS_DELTA.get(neighborhood, NEIGHBORHOODS_DELTA["two_opt"])
+    deadline = time.perf_counter() + time_limit if time_limit is not None else None
     
     for restart in range(restarts):
+        if deadline is not None and time.perf_counter() > deadline:
+            break
+        
         route = list(range(n))
         random.shuffle(route)
         current_length = tsp.route_length(route)
@@ -138,13 +159,19 @@ def ihc_with_intensification(
             
             # INTENSYFIKACJA: jeśli poprawa > próg, przeszukaj wszystkimi sąsiedztwami
             if improvement > intensification_threshold:
-                for neigh_name in ["swap", "insert", "two_opt"]:
-                    intensify_func = NEIGHBORHOODS_DELTA[neigh_name]
-                    for _ in range(iterations // 3):
-                        new_route, delta = intensify_func(route, tsp)
-                        if delta < 0:
-                            route = new_route
-                            current_length += delta
+                if intensification == "vnd":
+                    remaining = deadline - time.perf_counter() if deadline is not None else None
+                    route, current_length = variable_neighborhood_descent(
+                        tsp, route, current_length, time_limit=remaining
+                    )
+                else:
+                    for neigh_name in ["swap", "insert", "two_opt"]:
+                        intensify_func = NEIGHBORHOODS_DELTA[neigh_name]
+                        for _ in range(iterations // 3):
+                            new_route, delta = intensify_func(route, tsp)
+                            if delta < 0:
+                                route = new_route
+                                current_length += delta
                 
                 if current_length < best_global_length:
                     best_global_route = route[:]
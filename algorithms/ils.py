@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+"""
+Iterated Local Search (ILS) z perturbacją double-bridge
+dla problemu komiwojażera (TSP).
+
+Zamiast zaczynać każdy restart od losowej permutacji (jak IHC), ILS
+zaburza aktualne minimum lokalne ruchem double-bridge (A B C D -> A C B D),
+a następnie poprawia tylko okolicę zmienionych krawędzi lokalnym 2-opt
+z listami kandydatów i bitami "don't look".
+
+Parametry:
+- iterations: liczba perturbacji (kopnięć)
+- acceptance: kryterium akceptacji ("better", "always", "threshold")
+- threshold: dopuszczalne pogorszenie względem najlepszego (dla "threshold")
+- neighbors: rozmiar listy kandydatów w 2-opt
+- time_limit: opcjonalny limit czasu (sekundy)
+"""
+import random
+import time
+from collections import deque
+
+# Tolerancja na błędy zaokrągleń przy ocenie ruchów
+EPS = 1e-9
+
+
+def iterated_local_search(
+    tsp,
+    iterations=1000,
+    acceptance="better",
+    threshold=0.02,
+    neighbors=10,
+    time_limit=None,
+    use_nn_start=False
+):
+    """
+    Iterated Local Search (ILS)
+
+    Args:
+        tsp: obiekt TSP z macierzą odległości
+        iterations: maksymalna liczba perturbacji
+        acceptance: "better" - akceptuj nie gorsze od aktualnego,
+                    "always" - akceptuj zawsze (błądzenie losowe),
+                    "threshold" - akceptuj jeśli najwyżej threshold*100% gorsze od najlepszego
+        threshold: próg dla acceptance="threshold"
+        neighbors: liczba najbliższych sąsiadów sprawdzanych w 2-opt
+        time_limit: limit czasu w sekundach (None = brak)
+        use_nn_start: czy startować z rozwiązania NN
+
+    Returns:
+        (best_route, best_dist)
+    """
+    n = tsp.n
+    dm = tsp.dist_matrix
+    cand = tsp.neighbor_lists(neighbors)
+    deadline = time.perf_counter() + time_limit if time_limit is not None else None
+
+    # Rozwiązanie startowe
+    if use_nn_start:
+        from algorithms.nn import nearest_neighbor
+        current_route, current_dist = nearest_neighbor(tsp, start=random.randint(0, n-1))
+        current_route = list(current_route)
+    else:
+        current_route = list(range(n))
+        random.shuffle(current_route)
+        current_dist = tsp.route_length(current_route)
+
+    # Pierwsze minimum lokalne - wszystkie bity "don't look" wyłączone
+    current_dist += two_opt_dlb(current_route, dm, cand)
+
+    best_route = current_route[:]
+    best_dist = current_dist
+
+    if n < 8:  # Za mało miast na double-bridge
+        return best_route, best_dist
+
+    # === PĘTLA GŁÓWNA ILS ===
+    for _ in range(iterations):
+        if deadline is not None and time.perf_counter() > deadline:
+            break
+
+        # --- KROK 1: Perturbacja (kopnięcie) ---
+        route, kick_delta, touched = double_bridge(current_route, dm)
+
+        # --- KROK 2: Lokalna optymalizacja tylko wokół zmienionych krawędzi ---
+        dist = current_dist + kick_delta + two_opt_dlb(route, dm, cand, touched)
+
+        if dist < best_dist:
+            best_dist = dist
+            best_route = route[:]
+
+        # --- KROK 3: Kryterium akceptacji ---
+        if acceptance == "always":
+            accept = True
+        elif acceptance == "threshold":
+            accept = dist <= best_dist * (1 + threshold)
+        else:
+            accept = dist <= current_dist
+
+        if accept:
+            current_route = route
+            current_dist = dist
+
+    return best_route, best_dist
+
+
+def double_bridge(route, dm):
+    """
+    Perturbacja double-bridge: dzieli trasę na A B C D i skleja jako A C B D.
+
+    Ruchu nie da się odwrócić pojedynczym 2-opt, więc 2-opt nie wraca
+    od razu do poprzedniego minimum.
+
+    Returns:
+        (nowa_trasa, zmiana_kosztu, miasta_na_końcach_zmienionych_krawędzi)
+    """
+    n = len(route)
+    p1, p2, p3 = sorted(random.sample(range(1, n), 3))
+
+    a_end, b_start = route[p1 - 1], route[p1]
+    b_end, c_start = route[p2 - 1], route[p2]
+    c_end, d_start = route[p3 - 1], route[p3 % n]
+
+    old_cost = dm[a_end][b_start] + dm[b_end][c_start] + dm[c_end][d_start]
+    new_cost = dm[a_end][c_start] + dm[c_end][b_start] + dm[b_end][d_start]
+
+    new_route = route[:p1] + route[p2:p3] + route[p1:p2] + route[p3:]
+    touched = [a_end, b_start, b_end, c_start, c_end, d_start]
+
+    return new_route, new_cost - old_cost, touched
+
+
+def two_opt_dlb(route, dm, neighbors, active=None):
+    """
+    2-opt z listami kandydatów i bitami "don't look" (w miejscu).
+
+    Sprawdzane są tylko miasta z kolejki aktywnych; miasto bez poprawiającego
+    ruchu dostaje bit "don't look", a końce każdej wykonanej zamiany wracają
+    do kolejki. Po perturbacji wystarczy aktywować kilka miast.
+
+    Args:
+        route: trasa (modyfikowana w miejscu)
+        dm: macierz odległości
+        neighbors: listy kandydatów (tsp.neighbor_lists)
+        active: miasta do sprawdzenia (None = wszystkie)
+
+    Returns:
+        Sumaryczna zmiana kosztu (<= 0)
+    """
+    n = len(route)
+    pos = [0] * n
+    for i, city in enumerate(route):
+        pos[city] = i
+
+    queue = deque(range(n) if active is None else active)
+    in_queue = [False] * n
+    for city in queue:
+        in_queue[city] = True
+
+    total_delta = 0.0
+
+    while queue:
+        c1 = queue.popleft()
+        in_queue[c1] = False
+        improved = False
+
+        # Dwa kierunki: krawędź do następnika i do poprzednika c1
+        for succ in (True, False):
+            i = pos[c1]
+            c2 = route[(i + 1) % n] if succ else route[i - 1]
+            d12 = dm[c1][c2]
+
+            for c3 in neighbors[c1]:
+                d13 = dm[c1][c3]
+                if d13 >= d12:  # Dalsi kandydaci nie mogą dać poprawy
+                    break
+
+                j = pos[c3]
+                c4 = route[(j + 1) % n] if succ else route[j - 1]
+                if c3 == c2 or c4 == c1:
+                    continue
+
+                delta = d13 + dm[c2][c4] - d12 - dm[c3][c4]
+                if delta < -EPS:
+                    # Nowe krawędzie (c1,c3) i (c2,c4)
+                    if succ:
+                        _reverse(route, pos, (i + 1) % n, j)
+                    else:
+                        _reverse(route, pos, i, (j - 1) % n)
+                    total_delta += delta
+
+                    for city in (c1, c2, c3, c4):
+                        if not in_queue[city]:
+                            in_queue[city] = True
+                            queue.append(city)
+                    improved = True
+                    break
+
+            if improved:
+                break
+
+    return total_delta
+
+
+def _reverse(route, pos, i, j):
+    """
+    Odwraca cykliczny fragment trasy od pozycji i do j (włącznie).
+    Jeśli fragment jest dłuższy niż pół trasy, odwraca dopełnienie
+    (daje ten sam cykl, a jest tańsze).
+    """
+    n = len(route)
+    length = (j - i) % n + 1
+    if 2 * length > n:
+        i, j = (j + 1) % n, (i - 1) % n
+        length = n - length
+
+    for _ in range(length // 2):
+        ci, cj = route[i], route[j]
+        route[i], route[j] = cj, ci
+        pos[cj], pos[ci] = i, j
+        i = (i + 1) % n
+        j = (j - 1) % n
@@ -10,10 +10,25 @@ Parametry:
 - neighborhood: typ sąsiedztwa ("swap", "insert", "two_opt")
 - cooling_method: metoda chłodzenia ("geometric", "linear", "logarithmic")
 - iterations_per_temp: liczba iteracji dla każdej temperatury
+
+Kandydaci oceniani są w O(1) (delta kosztu ruchu), a trasa jest
+modyfikowana w miejscu tylko dla zaakceptowanych ruchów.
+
+Tryb blokowy (batch_size): ruchy i liczby losowe losowane są blokami
+w NumPy, delty całego bloku liczone wektorowo, a akceptowany jest pierwszy
+ruch spełniający test Metropolisa. Odrzucone ruchy nie zmieniają stanu,
+więc rozkład akceptacji jest taki sam jak w wersji sekwencyjnej.
 """
 import math
+import os
 import random
-from utils.neighborhoods import NEIGHBORHOODS, NEIGHBORHOODS_DELTA
+import time
+from multiprocessing import Pool
+import numpy as np
+from utils.neighborhoods import (
+    MOVE_DELTA, APPLY_MOVE, MOVE_DELTA_BATCH,
+    sample_move, sample_moves_batch, apply_move_array
+)
 
 
 def simulated_annealing(
@@ -24,31 +39,49 @@ def simulated_annealing(
     neighborhood="two_opt",
     cooling_method="geometric",
     iterations_per_temp=1,
-    use_nn_start=False
+    use_nn_start=False,
+    batch_size=None,
+    time_limit=None,
+    target_acceptance=0.8,
+    final_temp=None
 ):
     """
     Symulowane Wyżarzanie (SA)
     
     Args:
         tsp: obiekt TSP z macierzą odległości
-        temp: temperatura początkowa
+        temp: temperatura początkowa lub "auto" (kalibracja z próbki delt,
+              patrz estimate_initial_temperature)
         alpha: współczynnik chłodzenia (dla geometric: 0.9-0.99)
         iterations: maksymalna liczba iteracji
         neighborhood: typ sąsiedztwa ("swap", "insert", "two_opt")
-        cooling_method: "geometric", "linear", "logarithmic"
+        cooling_method: "geometric", "linear", "logarithmic", "budget"
+                        (budget: T = T0 * (T_end/T0)^postęp, postęp = i/iterations)
         iterations_per_temp: ile rozwiązań sprawdzić dla każdej temperatury
         use_nn_start: czy startować z rozwiązania NN
+        batch_size: maks. rozmiar bloku kandydatów w trybie blokowym
+                    (None = klasyczna pętla sekwencyjna)
+        time_limit: limit czasu w sekundach; temperatura zależy wtedy od
+                    ułamka zużytego czasu (jak "budget"), a iterations
+                    przestaje ograniczać pętlę - najlepszy wynik jest gotowy
+                    dokładnie w terminie
+        target_acceptance: docelowa początkowa akceptacja dla temp="auto"
+        final_temp: temperatura końcowa dla "budget"/time_limit
+                    (None = 1e-4 * temperatura początkowa)
     
     Returns:
         (best_route, best_dist)
     """
     n = tsp.n
+    if n < 2:  # Jedno miasto - jedyna trasa, brak ruchów do wylosowania
+        return list(range(n)), 0.0
+    dm = tsp.dist_matrix
     
-    # Wybór funkcji sąsiedztwa
-    if neighborhood in NEIGHBORHOODS:
-        move_func = NEIGHBORHOODS[neighborhood]
-    else:
-        move_func = NEIGHBORHOODS["two_opt"]
+    # Wybór funkcji sąsiedztwa (ocena delty + wykonanie w miejscu)
+    if neighborhood not in MOVE_DELTA:
+        neighborhood = "two_opt"
+    move_delta = MOVE_DELTA[neighborhood]
+    apply_move = APPLY_MOVE[neighborhood]
     
     # Generowanie rozwiązania startowego
     if use_nn_start:
@@ -63,6 +96,24 @@ def simulated_annealing(
     best_route = current_route[:]
     best_dist = current_dist
     
+    # Automatyczna kalibracja temperatury do skali odległości instancji
+    if temp == "auto":
+        temp = estimate_initial_temperature(tsp, current_route, neighborhood, target_acceptance)
+    if final_temp is None:
+        final_temp = temp * 1e-4
+    
+    if time_limit is not None:
+        cooling_method = "budget"
+    
+    if batch_size:
+        return _sa_batched(tsp, current_route, current_dist, temp, alpha, iterations,
+                           neighborhood, cooling_method, iterations_per_temp, batch_size,
+                           final_temp, time_limit)
+    
+    if time_limit is not None:
+        return _sa_timed(tsp, current_route, current_dist, temp, final_temp,
+                         time_limit, neighborhood)
+    
     t = temp
     initial_temp = temp
     
@@ -71,18 +122,17 @@ def simulated_annealing(
         
         # --- Iteracje dla aktualnej temperatury ---
         for _ in range(iterations_per_temp):
-            # Generuj losowego sąsiada
-            neighbor = move_func(current_route)
-            neighbor_dist = tsp.route_length(neighbor)
-            diff = neighbor_dist - current_dist  # Różnica kosztów
+            # Wylosuj ruch i oceń go w O(1) - bez kopiowania trasy
+            a, b = sample_move(n, neighborhood)
+            diff = move_delta(current_route, dm, a, b)  # Różnica kosztów
             
             # === KRYTERIUM AKCEPTACJI METROPOLIS ===
             # Kluczowy element SA - pozwala akceptować gorsze rozwiązania!
             
             if diff < 0:
                 # Lepsze rozwiązanie - ZAWSZE akceptuj
-                current_route = neighbor
-                current_dist = neighbor_dist
+                apply_move(current_route, a, b)
+                current_dist += diff
                 # Sprawdź czy nowe najlepsze globalne
                 if current_dist < best_dist:
                     best_dist = current_dist
@@ -92,24 +142,29 @@ def simulated_annealing(
                 # P = exp(-diff/T) - im wyższa temp, tym większa szansa
                 prob = math.exp(-diff / t)
                 if random.random() < prob:
-                    current_route = neighbor  # Akceptuj gorsze!
-                    current_dist = neighbor_dist
+                    apply_move(current_route, a, b)  # Akceptuj gorsze!
+                    current_dist += diff
         
         # --- Redukcja temperatury (chłodzenie) ---
         # Temperatura maleje co iterację wg wybranego schematu
-        t = _reduce_temperature(t, initial_temp, alpha, i, iterations, cooling_method)
+        t = _reduce_temperature(t, initial_temp, alpha, i, iterations, cooling_method, final_temp)
         
         # Zatrzymaj jeśli temperatura praktycznie zerowa
         if t < 1e-10:
             break
     
-    return best_route, best_dist
+    # Suma delt może zgubić ułamki przy milionach iteracji - przelicz dokładnie
+    return best_route, tsp.route_length(best_route)
 
 
-def _reduce_temperature(t, initial_temp, alpha, iteration, max_iterations, method):
+def _reduce_temperature(t, initial_temp, alpha, iteration, max_iterations, method,
+                        final_temp=None):
     """
     Różne metody redukcji temperatury.
     """
+    if method == "budget":
+        # T(k) = T0 * (T_end / T0)^(k / max_iter) - dochodzi do T_end na końcu budżetu
+        return initial_temp * (final_temp / initial_temp) ** ((iteration + 1) / max_iterations)
     if method == "geometric":
         # T(k+1) = alpha * T(k)
         return t * alpha
@@ -123,6 +178,169 @@ def _reduce_temperature(t, initial_temp, alpha, iteration, max_iterations, metho
         return t * alpha
 
 
+def _temperature_schedule(initial_temp, alpha, iteration, max_iterations, method,
+                          final_temp=None):
+    """
+    Temperatura w iteracji zewnętrznej `iteration` (tablica NumPy) - wektorowy
+    odpowiednik kolejnych wywołań _reduce_temperature.
+    """
+    k = np.maximum(iteration - 1, 0)  # temperaturę dla i liczy redukcja z i-1
+    if method == "budget":
+        return initial_temp * (final_temp / initial_temp) ** (iteration / max_iterations)
+    if method == "linear":
+        t = initial_temp * (1 - k / max_iterations)
+    elif method == "logarithmic":
+        t = initial_temp / np.log(k + 2)
+    else:
+        return initial_temp * alpha ** iteration
+    return np.where(iteration == 0, initial_temp, t)
+
+
+def _sa_batched(tsp, route, current_dist, temp, alpha, iterations,
+                neighborhood, cooling_method, iterations_per_temp, batch_size,
+                final_temp=None, time_limit=None):
+    """
+    Blokowa wersja pętli SA (NumPy).
+    
+    Dla każdego bloku: losowanie m ruchów i m liczb u ~ U(0,1], wektorowe
+    delty, test Metropolisa bez exp: delta < -T * log(u). Wykonywany jest
+    pierwszy zaakceptowany ruch, a licznik iteracji przesuwa się o jego
+    pozycję w bloku. Rozmiar bloku dopasowuje się do częstości akceptacji
+    (przy wysokiej temperaturze krótkie bloki, przy niskiej - długie).
+    
+    Z time_limit temperatura bloku wynika z ułamka zużytego czasu.
+    """
+    n = tsp.n
+    D = tsp.dist_array
+    batch_delta = MOVE_DELTA_BATCH[neighborhood]
+    rng = np.random.default_rng(random.getrandbits(64))  # zgodne z random.seed
+    
+    route = np.array(route)
+    best_route = route.copy()
+    best_dist = current_dist
+    
+    start = time.perf_counter()
+    total = iterations * iterations_per_temp if time_limit is None else float("inf")
+    k = 0  # Numer kandydata (łącznie z odrzuconymi)
+    m = min(8, batch_size)
+    
+    while k < total:
+        if time_limit is not None:
+            progress = (time.perf_counter() - start) / time_limit
+            if progress >= 1.0:
+                break
+            outer = np.zeros(m, dtype=int)
+            temps = np.full(m, temp * (final_temp / temp) ** progress)
+        else:
+            m = min(m, total - k)
+            outer = (k + np.arange(m)) // iterations_per_temp
+            temps = _temperature_schedule(temp, alpha, outer, iterations, cooling_method,
+                                          final_temp)
+        
+        # Zatrzymaj jeśli temperatura praktycznie zerowa (jak w wersji sekwencyjnej)
+        frozen = (outer > 0) & (temps < 1e-10)
+        stop = frozen.any()
+        if stop:
+            m = int(frozen.argmax())
+            temps = temps[:m]
+            if m == 0:
+                break
+        
+        a, b = sample_moves_batch(rng, n, neighborhood, m)
+        deltas = batch_delta(route, D, a, b)
+        u = 1.0 - rng.random(m)
+        accept = (deltas < 0) | ((temps > 0) & (deltas < -temps * np.log(u)))
+        
+        if accept.any():
+            idx = int(accept.argmax())
+            apply_move_array(route, neighborhood, int(a[idx]), int(b[idx]))
+            current_dist += deltas[idx]
+            if current_dist < best_dist:
+                best_dist = current_dist
+                best_route = route.copy()
+            k += idx + 1
+            m = min(batch_size, max(8, 4 * (idx + 1)))
+        else:
+            k += m
+            m = min(batch_size, 2 * m)
+            if stop:
+                break  # Wszyscy kandydaci przed zamrożeniem odrzuceni
+        # Po akceptacji w bloku z zamrożeniem kandydaci za nią nie zostali
+        # jeszcze wylosowani - kolejny obieg dobierze ich do indeksu zamrożenia
+    
+    best_route = best_route.tolist()
+    return best_route, tsp.route_length(best_route)
+
+
+def estimate_initial_temperature(tsp, route, neighborhood="two_opt",
+                                 target_acceptance=0.8, samples=1000):
+    """
+    Szacuje temperaturę początkową z próbki ruchów.
+    
+    Losuje `samples` ruchów z trasy `route` i dobiera T0 tak, aby średni
+    ruch pogarszający był akceptowany z prawdopodobieństwem target_acceptance:
+    T0 = -mean(delta > 0) / ln(target_acceptance).
+    
+    Returns:
+        Temperatura początkowa (w jednostkach odległości instancji)
+    
+    Raises:
+        ValueError: gdy target_acceptance nie leży w przedziale (0, 1)
+    """
+    if not 0 < target_acceptance < 1:
+        raise ValueError(f"target_acceptance musi leżeć w (0, 1), podano {target_acceptance}")
+    n = tsp.n
+    dm = tsp.dist_matrix
+    move_delta = MOVE_DELTA.get(neighborhood, MOVE_DELTA["two_opt"])
+    
+    positive = []
+    for _ in range(samples):
+        diff = move_delta(route, dm, *sample_move(n, neighborhood))
+        if diff > 0:
+            positive.append(diff)
+    
+    if not positive:
+        return 1.0
+    return -(sum(positive) / len(positive)) / math.log(target_acceptance)
+
+
+def _sa_timed(tsp, route, current_dist, temp, final_temp, time_limit, neighborhood):
+    """
+    Pętla SA sterowana czasem: T = T0 * (T_end/T0)^(czas / time_limit).
+    
+    Zegar sprawdzany jest co 100 iteracji; pętla kończy się w terminie.
+    """
+    n = tsp.n
+    dm = tsp.dist_matrix
+    move_delta = MOVE_DELTA[neighborhood]
+    apply_move = APPLY_MOVE[neighborhood]
+    
+    best_route = route[:]
+    best_dist = current_dist
+    
+    start = time.perf_counter()
+    log_ratio = math.log(final_temp / temp)
+    t = temp
+    
+    while True:
+        progress = (time.perf_counter() - start) / time_limit
+        if progress >= 1.0:
+            break
+        t = temp * math.exp(log_ratio * progress)
+        
+        for _ in range(100):
+            a, b = sample_move(n, neighborhood)
+            diff = move_delta(route, dm, a, b)
+            if diff < 0 or random.random() < math.exp(-diff / t):
+                apply_move(route, a, b)
+                current_dist += diff
+                if current_dist < best_dist:
+                    best_dist = current_dist
+                    best_route = route[:]
+    
+    return best_route, tsp.route_length(best_route)
+
+
 def sa_with_reheating(
     tsp,
     temp=1000,
@@ -151,7 +369,13 @@ def sa_with_reheating(
         (best_route, best_dist)
     """
     n = tsp.n
-    move_func = NEIGHBORHOODS.get(neighborhood, NEIGHBORHOODS["two_opt"])
+    if n < 2:  # Jedno miasto - jedyna trasa, brak ruchów do wylosowania
+        return list(range(n)), 0.0
+    dm = tsp.dist_matrix
+    if neighborhood not in MOVE_DELTA:
+        neighborhood = "two_opt"
+    move_delta = MOVE_DELTA[neighborhood]
+    apply_move = APPLY_MOVE[neighborhood]
     
     current_route = list(range(n))
     random.shuffle(current_route)
@@ -165,13 +389,12 @@ def sa_with_reheating(
     no_improve_count = 0
     
     for i in range(iterations):
-        neighbor = move_func(current_route)
-        neighbor_dist = tsp.route_length(neighbor)
-        diff = neighbor_dist - current_dist
+        a, b = sample_move(n, neighborhood)
+        diff = move_delta(current_route, dm, a, b)
         
         if diff < 0 or (t > 0 and random.random() < math.exp(-diff / t)):
-            current_route = neighbor
-            current_dist = neighbor_dist
+            apply_move(current_route, a, b)
+            current_dist += diff
             
             if current_dist < best_dist:
                 best_dist = current_dist
@@ -192,4 +415,162 @@ def sa_with_reheating(
         else:
             t *= alpha
     
-    return best_route, best_dist
\ No newline at end of file
+    return best_route, tsp.route_length(best_route)
+
+
+def parallel_tempering(
+    tsp,
+    n_replicas=None,
+    t_min=None,
+    t_max=None,
+    exchange_interval=2000,
+    n_exchanges=100,
+    neighborhood="two_opt",
+    processes=None,
+    use_nn_start=False
+):
+    """
+    USPRAWNIENIE: Parallel Tempering (replica-exchange SA)
+    
+    M łańcuchów (replik) działa przy STAŁYCH temperaturach z drabiny
+    geometrycznej t_min ... t_max, każdy w osobnym procesie. Co
+    exchange_interval kroków proponujemy zamianę stanów sąsiednich
+    temperatur, akceptowaną z prawdopodobieństwem
+    min(1, exp((1/T_i - 1/T_j) * (E_i - E_j))).
+    Gorące repliki eksplorują, zimne intensyfikują - nie trzeba stroić
+    alpha ani schematu chłodzenia.
+    
+    Args:
+        tsp: obiekt TSP
+        n_replicas: liczba replik (None = liczba rdzeni, min. 4)
+        t_min: najniższa temperatura (None = 0.01 * średnia krawędź trasy NN)
+        t_max: najwyższa temperatura (None = 0.3 * średnia krawędź trasy NN)
+        exchange_interval: liczba kroków Metropolisa między wymianami
+        n_exchanges: liczba rund wymian
+        neighborhood: typ sąsiedztwa
+        processes: liczba procesów (None = n_replicas, 1 = bez procesów)
+        use_nn_start: czy startować repliki z rozwiązań NN
+    
+    Returns:
+        (best_route, best_dist)
+    """
+    n = tsp.n
+    if n < 2:  # Jedno miasto - jedyna trasa, brak ruchów do wylosowania
+        return list(range(n)), 0.0
+    if neighborhood not in MOVE_DELTA:
+        neighborhood = "two_opt"
+    if n_replicas is None:
+        n_replicas = max(4, os.cpu_count() or 1)
+    if processes is None:
+        processes = n_replicas
+    
+    # Drabina temperatur - skala z długości krawędzi trasy NN
+    if t_min is None or t_max is None:
+        from algorithms.nn import nearest_neighbor
+        _, nn_dist = nearest_neighbor(tsp)
+        edge = nn_dist / n
+        if edge <= 0:  # Wszystkie miasta w jednym punkcie - brak skali odległości
+            t_min = t_min if t_min is not None else 1.0
+            t_max = t_max if t_max is not None else 1.0
+        t_min = t_min if t_min is not None else 0.01 * edge
+        t_max = t_max if t_max is not None else 0.3 * edge
+    if n_replicas > 1:
+        ratio = (t_max / t_min) ** (1.0 / (n_replicas - 1))
+        temps = [t_min * ratio ** i for i in range(n_replicas)]
+    else:
+        temps = [t_min]
+    
+    # Stany replik: states[i] = (trasa, koszt) przy temperaturze temps[i]
+    states = []
+    for _ in range(n_replicas):
+        if use_nn_start:
+            from algorithms.nn import nearest_neighbor
+            route, dist = nearest_neighbor(tsp, start=random.randint(0, n-1))
+            route = list(route)
+        else:
+            route = list(range(n))
+            random.shuffle(route)
+            dist = tsp.route_length(route)
+        states.append((route, dist))
+    
+    best_route = min(states, key=lambda s: s[1])[0][:]
+    best_dist = tsp.route_length(best_route)
+    
+    pool = Pool(processes, _pt_init, (tsp.dist_matrix,)) if processes > 1 else None
+    if pool is None:
+        _pt_init(tsp.dist_matrix)
+    
+    try:
+        for rnd in range(n_exchanges):
+            # --- KROK 1: Każda replika wykonuje exchange_interval kroków ---
+            tasks = [(route, dist, t, exchange_interval, neighborhood, random.getrandbits(64))
+                     for (route, dist), t in zip(states, temps)]
+            if pool is not None:
+                results = pool.map(_pt_run_chain, tasks)
+            else:
+                results = [_pt_run_chain(task) for task in tasks]
+            
+            states = []
+            for route, dist, chain_best_route, chain_best_dist in results:
+                states.append((route, dist))
+                if chain_best_dist < best_dist:
+                    best_dist = chain_best_dist
+                    best_route = chain_best_route
+            
+            # --- KROK 2: Wymiany między sąsiednimi temperaturami ---
+            # Naprzemiennie pary parzyste i nieparzyste
+            for i in range(rnd % 2, n_replicas - 1, 2):
+                e_i = states[i][1]
+                e_j = states[i + 1][1]
+                exponent = (1.0 / temps[i] - 1.0 / temps[i + 1]) * (e_i - e_j)
+                if exponent >= 0 or random.random() < math.exp(exponent):
+                    states[i], states[i + 1] = states[i + 1], states[i]
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    
+    return best_route, tsp.route_length(best_route)
+
+
+# Macierz odległości w procesie roboczym (ustawiana raz, przez initializer)
+_PT_DIST_MATRIX = None
+
+
+def _pt_init(dist_matrix):
+    """Inicjalizacja procesu roboczego parallel tempering."""
+    global _PT_DIST_MATRIX
+    _PT_DIST_MATRIX = dist_matrix
+
+
+def _pt_run_chain(task):
+    """
+    Łańcuch Metropolisa przy stałej temperaturze (w procesie roboczym).
+    
+    Returns:
+        (trasa, koszt, najlepsza_trasa_łańcucha, jej_koszt)
+    """
+    route, dist, t, steps, neighborhood, seed = task
+    # Każde zadanie z własnym strumieniem liczb - lokalny generator, bo przy
+    # processes=1 łańcuch działa w procesie wywołującym i nie może mu
+    # nadpisać globalnego stanu modułu random
+    rng = random.Random(seed)
+    dm = _PT_DIST_MATRIX
+    n = len(route)
+    move_delta = MOVE_DELTA[neighborhood]
+    apply_move = APPLY_MOVE[neighborhood]
+    
+    best_route = route[:]
+    best_dist = dist
+    
+    for _ in range(steps):
+        a, b = sample_move(n, neighborhood, rng)
+        diff = move_delta(route, dm, a, b)
+        if diff < 0 or rng.random() < math.exp(-diff / t):
+            apply_move(route, a, b)
+            dist += diff
+            if dist < best_dist:
+                best_dist = dist
+                best_route = route[:]
+    
+    return route, dist, best_route, best_dist
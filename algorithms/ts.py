@@ -9,10 +9,27 @@ Parametry:
 - neighborhood: typ sąsiedztwa ("swap", "insert", "two_opt")
 - aspiration: czy używać kryterium aspiracji
 - candidates_per_iter: liczba kandydatów sprawdzanych w każdej iteracji
+- tabu_type: rodzaj pamięci tabu ("attribute" lub "solution")
+- diversification: rodzaj dywersyfikacji ("frequency" lub "random")
+
+Pamięć atrybutowa (domyślna): krawędzie usunięte przez wykonany ruch są
+zakazane do ponownego dodania przez tabu_size iteracji. Czas wygaśnięcia
+trzymany jest w macierzy n x n, więc sprawdzenie ruchu kosztuje O(1).
+Pamięć rozwiązań: zbiór haszy Zobrista odwiedzonych tras (8-bajtowe
+liczby aktualizowane w O(1) po każdym ruchu) - do porównań.
+
+Kandydaci oceniani są deltą kosztu w O(1) względem aktualnej trasy;
+w miejscu wykonywany jest tylko wybrany ruch, więc iteracja kosztuje
+O(candidates_per_iter) zamiast O(candidates_per_iter * n).
 """
 import random
 from collections import deque
-from utils.neighborhoods import NEIGHBORHOODS
+import numpy as np
+from utils.neighborhoods import (
+    APPLY_MOVE, MOVE_DELTA, MOVE_EDGES, sample_move,
+    swap_move_delta_batch, two_opt_move_delta_batch, apply_move_array
+)
+from utils.zobrist import ZobristHash
 
 
 def tabu_search(
@@ -23,7 +40,8 @@ def tabu_search(
     aspiration=True,
     candidates_per_iter=20,
     no_improve_limit=None,
-    use_nn_start=False
+    use_nn_start=False,
+    tabu_type="attribute"
 ):
     """
     Przeszukiwanie z listą Tabu (TS)
@@ -31,23 +49,28 @@ def tabu_search(
     Args:
         tsp: obiekt TSP z macierzą odległości
         iterations: maksymalna liczba iteracji
-        tabu_size: długość listy tabu
+        tabu_size: długość listy tabu (dla "attribute": kadencja w iteracjach)
         neighborhood: typ sąsiedztwa ("swap", "insert", "two_opt")
         aspiration: czy używać kryterium aspiracji (akceptuj tabu jeśli lepsze od best)
         candidates_per_iter: liczba kandydatów do sprawdzenia w iteracji
         no_improve_limit: limit iteracji bez poprawy (None = brak)
         use_nn_start: czy startować z rozwiązania NN
+        tabu_type: "attribute" (zakazane krawędzie) lub "solution" (zakazane trasy)
     
     Returns:
         (best_route, best_dist)
     """
     n = tsp.n
+    if n < 2:  # Jedno miasto - jedyna trasa, brak ruchów do wylosowania
+        return list(range(n)), 0.0
     
     # Wybór funkcji sąsiedztwa
-    if neighborhood in NEIGHBORHOODS:
-        move_func = NEIGHBORHOODS[neighborhood]
-    else:
-        move_func = NEIGHBORHOODS["two_opt"]
+    dm = tsp.dist_matrix
+    if neighborhood not in APPLY_MOVE:
+        neighborhood = "two_opt"
+    move_delta = MOVE_DELTA[neighborhood]
+    apply_move = APPLY_MOVE[neighborhood]
+    move_edges = MOVE_EDGES[neighborhood]
     
     # Rozwiązanie startowe
     if use_nn_start:
@@ -62,40 +85,65 @@ def tabu_search(
     best_route = current_route[:]
     best_dist = current_dist
     
-    # Lista tabu - przechowuje krotki (tuple) reprezentujące trasę
-    tabu_list = deque(maxlen=tabu_size)
+    # Lista tabu rozwiązań - hasze Zobrista tras (zbiór + kolejka do wygaszania)
+    zobrist = ZobristHash(n)
+    current_hash = zobrist.tour_hash(current_route)
+    tabu_set = set()
+    tabu_queue = deque()
+    # Pamięć atrybutowa: tabu_until[u][v] = pierwsza iteracja, w której krawędź (u,v)
+    # znów jest dozwolona (tabu przez tabu_size kolejnych iteracji)
+    tabu_until = [[0] * n for _ in range(n)]
     
     no_improve_count = 0
     
     # === PĘTLA GŁÓWNA TABU SEARCH ===
-    for _ in range(iterations):
-        best_candidate = None  # Najlepszy kandydat w tej iteracji
+    for it in range(iterations):
+        best_move = None  # Najlepszy ruch (a, b) w tej iteracji
         best_candidate_dist = float('inf')
         best_candidate_tabu = False
+        best_removed = None  # Krawędzie usuwane przez wybrany ruch
+        best_hash = None
         
         # --- KROK 1: Generuj i oceń sąsiadów (kandydatów) ---
         for _ in range(candidates_per_iter):
-            # Wygeneruj losowego sąsiada
-            candidate = move_func(current_route)
-            candidate_tuple = tuple(candidate)  # Konwertuj na krotkę (hashable)
-            is_tabu = candidate_tuple in tabu_list  # Czy na liście tabu?
-            candidate_dist = tsp.route_length(candidate)  # Oceń kandydata
+            # Wylosuj ruch i oceń go deltą w O(1) - bez kopiowania trasy
+            a, b = sample_move(n, neighborhood)
+            candidate_dist = current_dist + move_delta(current_route, dm, a, b)
+            
+            # Status tabu sprawdzamy tylko dla kandydatów lepszych od dotychczasowych
+            if candidate_dist >= best_candidate_dist:
+                continue
+            
+            # Czy ruch jest tabu? (oba warianty w O(1))
+            removed, added = move_edges(current_route, a, b)
+            if tabu_type == "solution":
+                candidate_hash = zobrist.move_hash(current_hash, removed, added)
+                is_tabu = candidate_hash in tabu_set
+            else:
+                candidate_hash = None
+                is_tabu = any(tabu_until[u][v] > it for u, v in added)
             
-            # Sprawdź czy kandydat jest najlepszy wśród sprawdzonych
-            if candidate_dist < best_candidate_dist:
-                # === KRYTERIUM ASPIRACJI ===
-                # Wyjątek: akceptuj ruch tabu jeśli daje NOWY NAJLEPSZY wynik
-                if not is_tabu or (aspiration and candidate_dist < best_dist):
-                    best_candidate = candidate
-                    best_candidate_dist = candidate_dist
-                    best_candidate_tabu = is_tabu
+            # === KRYTERIUM ASPIRACJI ===
+            # Wyjątek: akceptuj ruch tabu jeśli daje NOWY NAJLEPSZY wynik
+            if not is_tabu or (aspiration and candidate_dist < best_dist):
+                best_move = (a, b)
+                best_candidate_dist = candidate_dist
+                best_candidate_tabu = is_tabu
+                best_removed = removed
+                best_hash = candidate_hash
         
-        # --- KROK 2: Wykonaj najlepszy znaleziony ruch ---
-        if best_candidate is not None:
-            current_route = best_candidate  # Przejdź do nowego rozwiązania
+        # --- KROK 2: Wykonaj najlepszy znaleziony ruch (w miejscu) ---
+        if best_move is not None:
+            apply_move(current_route, *best_move)  # Przejdź do nowego rozwiązania
             current_dist = best_candidate_dist
-            # Dodaj do listy tabu (zapobiega cofaniu się)
-            tabu_list.append(tuple(current_route))
+            # Zapamiętaj w pamięci tabu (zapobiega cofaniu się)
+            if tabu_type == "solution":
+                current_hash = best_hash
+                _remember(tabu_set, tabu_queue, current_hash, tabu_size)
+            else:
+                # Usunięte krawędzie nie wrócą przez tabu_size iteracji
+                for u, v in best_removed:
+                    tabu_until[u][v] = tabu_until[v][u] = it + tabu_size + 1
             
             # Aktualizuj najlepsze globalne rozwiązanie
             if current_dist < best_dist:
@@ -111,7 +159,224 @@ def tabu_search(
         if no_improve_limit and no_improve_count >= no_improve_limit:
             break
     
-    return best_route, best_dist
+    # Suma delt może zgubić ułamki - przelicz dokładnie
+    return best_route, tsp.route_length(best_route)
+
+
+def tabu_search_best_improvement(
+    tsp,
+    iterations=500,
+    tabu_size=20,
+    neighborhood="swap",
+    aspiration=True,
+    no_improve_limit=None,
+    use_nn_start=False
+):
+    """
+    USPRAWNIENIE: TS z pełnym przeglądem sąsiedztwa (best-improvement)
+    
+    Zamiast losować candidates_per_iter kandydatów, w każdej iteracji
+    wybieramy najlepszy nie-tabu ruch z CAŁEGO sąsiedztwa. Wartości
+    wszystkich ruchów trzymane są w macierzy M[a][b] (NumPy), a obok niej
+    minimum każdego wiersza (wartość i kolumna). Po ruchu przeliczamy tylko
+    wiersze i kolumny pozycji, których wartości mogły się zmienić:
+    - swap: pozycje {i-1, i, i+1, j-1, j, j+1} - 6 wierszy i 6 kolumn,
+      czyli O(n) na iterację;
+    - two_opt: pozycje odwróconego fragmentu (odwracamy krótszą stronę
+      cyklu, najwyżej n/2 pozycji) - O(n * L) dla fragmentu długości L,
+      w najgorszym razie O(n^2).
+    Wybór ruchu: najpierw minimum z n minimów wierszy; dopiero gdy ruch
+    jest tabu (atrybutowa pamięć krawędzi) bez aspiracji, przeglądamy
+    wiersze w kolejności ich minimów.
+    
+    Args:
+        tsp: obiekt TSP
+        iterations: maksymalna liczba iteracji
+        tabu_size: kadencja tabu (w iteracjach) usuniętych krawędzi
+        neighborhood: "swap" lub "two_opt"
+        aspiration: czy akceptować ruch tabu dający nowy najlepszy wynik
+        no_improve_limit: limit iteracji bez poprawy (None = brak)
+        use_nn_start: czy startować z rozwiązania NN
+    
+    Returns:
+        (best_route, best_dist)
+    """
+    n = tsp.n
+    D = tsp.dist_array
+    if neighborhood != "swap":
+        neighborhood = "two_opt"
+    move_edges = MOVE_EDGES[neighborhood]
+    
+    if use_nn_start:
+        from algorithms.nn import nearest_neighbor
+        route, current_dist = nearest_neighbor(tsp, start=random.randint(0, n-1))
+    else:
+        route = list(range(n))
+        random.shuffle(route)
+        current_dist = tsp.route_length(route)
+    route = np.array(route)
+    
+    best_route = route.copy()
+    best_dist = current_dist
+    
+    tabu_until = [[0] * n for _ in range(n)]
+    
+    # Macierz wartości ruchów (inf = ruch niedozwolony / pusty)
+    if neighborhood == "swap":
+        delta_batch = swap_move_delta_batch
+        width = n
+        rows = np.arange(n)[:, None]
+        cols = np.arange(width)[None, :]
+        valid = rows < cols
+    else:
+        delta_batch = two_opt_move_delta_batch
+        width = n + 1
+        rows = np.arange(n)[:, None]
+        cols = np.arange(width)[None, :]
+        valid = (cols - rows >= 2) & (cols - rows < n - 1)
+    moves = np.where(valid, delta_batch(route, D, rows, cols), np.inf)
+    
+    # Minimum każdego wiersza - wybór ruchu przegląda n wartości, nie n^2
+    row_arg = moves.argmin(axis=1)
+    row_best = moves[np.arange(n), row_arg]
+    
+    def admissible(a, b, delta):
+        """Usunięte krawędzie ruchu, jeśli nie jest tabu (lub aspiruje), inaczej None."""
+        removed, added = move_edges(route, a, b)
+        is_tabu = any(tabu_until[u][v] > it for u, v in added)
+        if not is_tabu or (aspiration and current_dist + delta < best_dist):
+            return removed
+        return None
+    
+    no_improve_count = 0
+    
+    for it in range(iterations):
+        # --- KROK 1: Najlepszy dopuszczalny ruch z całego sąsiedztwa ---
+        chosen = None
+        r = int(np.argmin(row_best))
+        if row_best[r] < np.inf:
+            removed = admissible(r, int(row_arg[r]), row_best[r])
+            if removed is not None:
+                chosen = (r, int(row_arg[r]), row_best[r], removed)
+            else:
+                chosen = _best_admissible_move(moves, row_best, admissible)
+        
+        if chosen is None:
+            no_improve_count += 1
+        else:
+            # --- KROK 2: Wykonaj ruch i zaktualizuj pamięć tabu ---
+            a, b, delta, removed = chosen
+            if neighborhood == "swap":
+                apply_move_array(route, neighborhood, a, b)
+                changed = np.array([a, b])
+            else:
+                changed = _reverse_shorter_side(route, a, b)
+            current_dist += delta
+            for u, v in removed:
+                tabu_until[u][v] = tabu_until[v][u] = it + tabu_size + 1
+            
+            if current_dist < best_dist:
+                best_dist = current_dist
+                best_route = route.copy()
+                no_improve_count = 0
+            else:
+                no_improve_count += 1
+            
+            # --- KROK 3: Aktualizacja macierzy tylko dla zmienionych pozycji ---
+            if neighborhood == "swap":
+                # Ruch (i, j) zależy od miast na i-1, i, i+1, j-1, j, j+1
+                touched = np.concatenate(((changed - 1) % n, changed, (changed + 1) % n))
+            else:
+                # Ruch (i, j) zależy od miast na i-1 (mod n), i, j-1 oraz j mod n
+                touched = np.concatenate((changed, changed + 1, (changed + 1) % n))
+                if (changed == 0).any():
+                    touched = np.append(touched, n)
+            _refresh_moves(moves, valid, row_best, row_arg, np.unique(touched),
+                           lambda r, c: delta_batch(route, D, r, c))
+        
+        if no_improve_limit and no_improve_count >= no_improve_limit:
+            break
+    
+    best_route = best_route.tolist()
+    return best_route, tsp.route_length(best_route)
+
+
+def _best_admissible_move(moves, row_best, admissible):
+    """
+    Najlepszy dopuszczalny ruch, gdy minimum globalne jest tabu.
+    
+    Wiersze przeglądane rosnąco po ich minimach; w wierszu wartości
+    rosnąco aż do pierwszej dopuszczalnej. Kończymy, gdy minimum kolejnego
+    wiersza nie jest lepsze od znalezionego ruchu.
+    
+    Returns:
+        (a, b, delta, usunięte_krawędzie) lub None (wszystkie ruchy tabu)
+    """
+    chosen = None
+    for r in np.argsort(row_best):
+        if row_best[r] == np.inf or (chosen is not None and row_best[r] >= chosen[2]):
+            break
+        row = moves[r]
+        for c in np.argsort(row):
+            delta = row[c]
+            if delta == np.inf or (chosen is not None and delta >= chosen[2]):
+                break
+            removed = admissible(int(r), int(c), delta)
+            if removed is not None:
+                chosen = (int(r), int(c), delta, removed)
+                break
+    return chosen
+
+
+def _reverse_shorter_side(route, a, b):
+    """
+    Ruch 2-opt (a, b) w miejscu: odwraca route[a:b] albo - gdy jest krótsze -
+    cykliczne dopełnienie (ta sama trasa, przebiegana w drugą stronę).
+    
+    Returns:
+        pozycje, na których zmieniły się miasta
+    """
+    n = len(route)
+    if 2 * (b - a) <= n:
+        positions = np.arange(a, b)
+    else:
+        positions = np.arange(b, a + n) % n
+    route[positions] = route[positions[::-1]]
+    return positions
+
+
+def _refresh_moves(moves, valid, row_best, row_arg, positions, delta_batch):
+    """
+    Przelicza wiersze i kolumny macierzy ruchów dla podanych pozycji
+    i poprawia minima wierszy (w miejscu).
+    
+    Minimum wiersza spoza `positions` liczymy od nowa tylko wtedy, gdy
+    leżało w przeliczonej kolumnie i nowa wartość je pogorszyła.
+    """
+    n_rows, width = moves.shape
+    all_rows = np.arange(n_rows)
+    cols = positions[positions < width]
+    rows = positions[positions < n_rows]
+    
+    # Kolumny - wszystkie wiersze
+    col_values = np.where(valid[:, cols], delta_batch(all_rows[:, None], cols[None, :]), np.inf)
+    moves[:, cols] = col_values
+    # Wiersze - wszystkie kolumny
+    moves[rows] = np.where(valid[rows], delta_batch(rows[:, None], np.arange(width)[None, :]), np.inf)
+    
+    col_arg = col_values.argmin(axis=1)
+    col_best = col_values[all_rows, col_arg]
+    better = col_best < row_best
+    row_best[better] = col_best[better]
+    row_arg[better] = cols[col_arg[better]]
+    
+    stale = ~better & np.isin(row_arg, cols)
+    stale[rows] = True
+    stale = np.flatnonzero(stale)
+    if len(stale):
+        arg = moves[stale].argmin(axis=1)
+        row_arg[stale] = arg
+        row_best[stale] = moves[stale, arg]
 
 
 def tabu_search_diversification(
@@ -120,7 +385,10 @@ def tabu_search_diversification(
     tabu_size=20,
     neighborhood="two_opt",
     diversification_threshold=50,
-    diversification_strength=0.3
+    diversification_strength=0.3,
+    tabu_type="attribute",
+    diversification="frequency",
+    frequency_weight=0.5
 ):
     """
     USPRAWNIENIE AUTORSKIE: TS z dywersyfikacją
@@ -129,19 +397,38 @@ def tabu_search_diversification(
     wykonujemy dywersyfikację - silne perturbacje rozwiązania
     aby eksplorować nowe regiony przestrzeni rozwiązań.
     
+    Pamięć długoterminowa (diversification="frequency"): macierz rezydencji
+    krawędzi - przez ile iteracji każda krawędź była w aktualnej trasie.
+    Jest wykorzystywana na dwa sposoby:
+    - ruchy niepoprawiające dostają karę proporcjonalną do rezydencji
+      dodawanych krawędzi, więc przeszukiwanie samo omija nadużywane krawędzie,
+    - restart buduje trasę zachłannie (najbliższy sąsiad) na odległościach
+      zwiększonych o częstość krawędzi, zamiast psuć trasę losowymi zamianami.
+    
     Args:
         tsp: obiekt TSP
         iterations: liczba iteracji
         tabu_size: długość listy tabu
         neighborhood: typ sąsiedztwa
         diversification_threshold: iteracje bez poprawy do dywersyfikacji
-        diversification_strength: siła perturbacji (0.0-1.0)
+        diversification_strength: siła perturbacji (0.0-1.0, dla "random")
+        tabu_type: "attribute" (zakazane krawędzie) lub "solution" (zakazane trasy)
+        diversification: "frequency" (pamięć długoterminowa) lub "random" (losowe zamiany)
+        frequency_weight: waga kary za częstość krawędzi
     
     Returns:
         (best_route, best_dist)
     """
     n = tsp.n
-    move_func = NEIGHBORHOODS.get(neighborhood, NEIGHBORHOODS["two_opt"])
+    if n < 2:  # Jedno miasto - jedyna trasa, brak ruchów do wylosowania
+        return list(range(n)), 0.0
+    dm = tsp.dist_matrix
+    if neighborhood not in APPLY_MOVE:
+        neighborhood = "two_opt"
+    move_delta = MOVE_DELTA[neighborhood]
+    apply_move = APPLY_MOVE[neighborhood]
+    move_edges = MOVE_EDGES[neighborhood]
+    use_frequency = diversification == "frequency"
     
     current_route = list(range(n))
     random.shuffle(current_route)
@@ -150,25 +437,73 @@ def tabu_search_diversification(
     best_route = current_route[:]
     best_dist = current_dist
     
-    tabu_list = deque(maxlen=tabu_size)
+    zobrist = ZobristHash(n)
+    current_hash = zobrist.tour_hash(current_route)
+    tabu_set = set()
+    tabu_queue = deque()
+    tabu_until = [[0] * n for _ in range(n)]
     no_improve_count = 0
     
-    for _ in range(iterations):
-        best_candidate = None
-        best_candidate_dist = float('inf')
+    # Pamięć długoterminowa: residency[u][v] - liczba iteracji, przez które
+    # krawędź była w trasie (bez bieżącego pobytu); since[u][v] - iteracja
+    # dodania krawędzi obecnej w trasie (-1 gdy jej nie ma). Aktualizacja O(1)
+    # na krawędź ruchu zamiast O(n) na iterację.
+    residency = [[0] * n for _ in range(n)]
+    since = [[-1] * n for _ in range(n)]
+    _open_edges(since, _tour_edges(current_route), 0)
+    
+    for it in range(iterations):
+        best_move = None
+        best_candidate_score = float('inf')
+        best_candidate_dist = None
+        best_removed = None
+        best_added = None
+        best_hash = None
+        
+        # Kara za częstość: średnia krawędź * waga * udział iteracji,
+        # w których dodawane krawędzie już były w trasie
+        penalty_scale = frequency_weight * current_dist / (n * (it + 1)) if use_frequency else 0.0
         
         for _ in range(20):
-            candidate = move_func(current_route)
-            if tuple(candidate) not in tabu_list:
-                d = tsp.route_length(candidate)
-                if d < best_candidate_dist:
-                    best_candidate = candidate
-                    best_candidate_dist = d
+            a, b = sample_move(n, neighborhood)
+            d = current_dist + move_delta(current_route, dm, a, b)
+            if d >= best_candidate_score:
+                continue
+            
+            removed, added = move_edges(current_route, a, b)
+            score = d
+            if penalty_scale and d >= current_dist:
+                # Tylko ruchy niepoprawiające są karane
+                score += penalty_scale * sum(residency[u][v] for u, v in added)
+                if score >= best_candidate_score:
+                    continue
+            
+            if tabu_type == "solution":
+                candidate_hash = zobrist.move_hash(current_hash, removed, added)
+                is_tabu = candidate_hash in tabu_set
+            else:
+                candidate_hash = None
+                is_tabu = any(tabu_until[u][v] > it for u, v in added)
+            
+            if not is_tabu:
+                best_move = (a, b)
+                best_candidate_score = score
+                best_candidate_dist = d
+                best_removed = removed
+                best_added = added
+                best_hash = candidate_hash
         
-        if best_candidate:
-            current_route = best_candidate
+        if best_move is not None:
+            apply_move(current_route, *best_move)
             current_dist = best_candidate_dist
-            tabu_list.append(tuple(current_route))
+            if tabu_type == "solution":
+                current_hash = best_hash
+                _remember(tabu_set, tabu_queue, current_hash, tabu_size)
+            else:
+                for u, v in best_removed:
+                    tabu_until[u][v] = tabu_until[v][u] = it + tabu_size + 1
+            _close_edges(residency, since, best_removed, it)
+            _open_edges(since, best_added, it)
             
             if current_dist < best_dist:
                 best_dist = current_dist
@@ -179,16 +514,86 @@ def tabu_search_diversification(
         else:
             no_improve_count += 1
         
-        # DYWERSYFIKACJA: Silna perturbacja gdy utknęliśmy
+        # DYWERSYFIKACJA: gdy utknęliśmy
         if no_improve_count >= diversification_threshold:
-            # Liczba par do zamiany
-            num_swaps = int(n * diversification_strength)
-            for _ in range(max(1, num_swaps)):
-                a, b = random.sample(range(n), 2)
-                current_route[a], current_route[b] = current_route[b], current_route[a]
+            _close_edges(residency, since, _tour_edges(current_route), it)
             
+            if use_frequency:
+                # Restart zachłanny omijający nadużywane krawędzie
+                current_route = _frequency_restart(dm, residency, it + 1, frequency_weight)
+            else:
+                # Silna perturbacja: losowe zamiany par
+                num_swaps = int(n * diversification_strength)
+                for _ in range(max(1, num_swaps)):
+                    a, b = random.sample(range(n), 2)
+                    current_route[a], current_route[b] = current_route[b], current_route[a]
+            
+            _open_edges(since, _tour_edges(current_route), it)
             current_dist = tsp.route_length(current_route)
-            tabu_list.clear()  # Wyczyść listę tabu po dywersyfikacji
+            current_hash = zobrist.tour_hash(current_route)
+            tabu_set.clear()  # Wyczyść listę tabu po dywersyfikacji
+            tabu_queue.clear()
+            tabu_until = [[0] * n for _ in range(n)]
             no_improve_count = 0
+            
+            if current_dist < best_dist:
+                best_dist = current_dist
+                best_route = current_route[:]
     
-    return best_route, best_dist
\ No newline at end of file
+    return best_route, tsp.route_length(best_route)
+
+
+def _tour_edges(route):
+    """Lista krawędzi (u, v) trasy zamkniętej."""
+    return list(zip(route, route[1:] + route[:1]))
+
+
+def _open_edges(since, edges, it):
+    """Zapamiętuje iterację dodania krawędzi do trasy."""
+    for u, v in edges:
+        since[u][v] = since[v][u] = it
+
+
+def _close_edges(residency, since, edges, it):
+    """Dolicza czas pobytu usuwanych krawędzi do pamięci długoterminowej."""
+    for u, v in edges:
+        if since[u][v] >= 0:
+            residency[u][v] += it - since[u][v]
+            residency[v][u] = residency[u][v]
+            since[u][v] = since[v][u] = -1
+
+
+def _frequency_restart(dm, residency, iterations_done, weight):
+    """
+    Nowa trasa metodą najbliższego sąsiada na odległościach karanych
+    częstością: d'(u, v) = d(u, v) * (1 + weight * rezydencja(u, v) / iteracje).
+    Krawędzie obecne w wielu dotychczasowych trasach stają się "dłuższe".
+    """
+    n = len(dm)
+    current = random.randrange(n)
+    route = [current]
+    unvisited = set(range(n))
+    unvisited.discard(current)
+    scale = weight / iterations_done
+    
+    while unvisited:
+        row = dm[current]
+        freq = residency[current]
+        current = min(unvisited, key=lambda c: row[c] * (1 + scale * freq[c]))
+        route.append(current)
+        unvisited.discard(current)
+    
+    return route
+
+
+def _remember(tabu_set, tabu_queue, h, tabu_size):
+    """
+    Dodaje hasz trasy do listy tabu rozwiązań; najstarszy wygasa
+    po przekroczeniu tabu_size.
+    """
+    if h in tabu_set:
+        return
+    tabu_set.add(h)
+    tabu_queue.append(h)
+    if len(tabu_queue) > tabu_size:
+        tabu_set.discard(tabu_queue.popleft())
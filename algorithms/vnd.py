@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+Variable Neighborhood Descent (VND) dla problemu komiwojażera (TSP).
+
+Deterministyczne przeszukiwanie lokalne po uporządkowanej liście sąsiedztw:
+każde sąsiedztwo jest przeglądane wyczerpująco (wszystkie pary pozycji)
+z oceną O(1) każdego ruchu. Po każdej poprawie wracamy do pierwszego
+sąsiedztwa, a kończymy gdy żadne sąsiedztwo nie daje poprawy - wynik jest
+minimum lokalnym względem wszystkich podanych sąsiedztw naraz.
+
+Może być używany samodzielnie albo jako etap "polerowania" w innych
+algorytmach (np. intensyfikacja w IHC).
+
+Parametry:
+- neighborhoods: kolejność sąsiedztw ("swap", "insert", "two_opt")
+- time_limit: opcjonalny limit czasu (sekundy)
+"""
+import time
+from utils.neighborhoods import MOVE_DELTA, APPLY_MOVE
+
+# Kolejność domyślna: najsilniejsze sąsiedztwo (2-opt) na początku,
+# swap na końcu jako najsłabsze
+DEFAULT_NEIGHBORHOODS = ("two_opt", "insert", "swap")
+
+# Tolerancja na błędy zaokrągleń - chroni przed zapętleniem na ruchach
+# o delcie rzędu 1e-12
+EPS = 1e-9
+
+
+def variable_neighborhood_descent(
+    tsp,
+    route,
+    route_length=None,
+    neighborhoods=DEFAULT_NEIGHBORHOODS,
+    time_limit=None
+):
+    """
+    Variable Neighborhood Descent (VND)
+
+    Args:
+        tsp: obiekt TSP z macierzą odległości
+        route: trasa startowa (nie jest modyfikowana)
+        route_length: długość trasy startowej (None = policz)
+        neighborhoods: uporządkowana lista sąsiedztw
+        time_limit: limit czasu w sekundach (None = do minimum lokalnego)
+
+    Returns:
+        (best_route, best_length)
+    """
+    route = list(route)
+    if route_length is None:
+        route_length = tsp.route_length(route)
+
+    if len(route) < 4:  # Każda permutacja to ta sama trasa - nie ma czego poprawiać
+        return route, route_length
+
+    deadline = time.perf_counter() + time_limit if time_limit is not None else None
+
+    k = 0  # Indeks aktualnego sąsiedztwa
+    while k < len(neighborhoods):
+        if deadline is not None and time.perf_counter() > deadline:
+            break
+
+        delta = _first_improvement(route, tsp.dist_matrix, neighborhoods[k])
+
+        if delta < 0:
+            route_length += delta
+            k = 0  # Poprawa - wróć do pierwszego sąsiedztwa
+        else:
+            k += 1  # Minimum lokalne tego sąsiedztwa - przejdź do następnego
+
+    return route, route_length
+
+
+def _first_improvement(route, dm, neighborhood):
+    """
+    Przegląda wyczerpująco sąsiedztwo i wykonuje (w miejscu) pierwszy
+    poprawiający ruch. Zwraca jego deltę lub 0.0 gdy poprawy brak.
+    """
+    n = len(route)
+    move_delta = MOVE_DELTA[neighborhood]
+    apply_move = APPLY_MOVE[neighborhood]
+
+    for a, b in _move_pairs(n, neighborhood):
+        delta = move_delta(route, dm, a, b)
+        if delta < -EPS:
+            apply_move(route, a, b)
+            return delta
+
+    return 0.0
+
+
+def _move_pairs(n, neighborhood):
+    """
+    Generuje wszystkie (niepuste) pary pozycji (a, b) dla danego sąsiedztwa.
+    """
+    if neighborhood == "two_opt":
+        # Odwrócenie route[a:b]; pomijamy odwrócenia nie zmieniające cyklu
+        for a in range(n - 1):
+            for b in range(a + 2, min(n + 1, a + n - 1)):
+                yield a, b
+    elif neighborhood == "insert":
+        for a in range(n):
+            for b in range(n):
+                if a != b:
+                    yield a, b
+    else:
+        for a in range(n - 1):
+            for b in range(a + 1, n):
+                yield a, b
@@ -10,8 +10,10 @@ Zawiera:
 from experiments.run_tests import (
     run_all_tests,
     run_multiple_times,
+    compare_at_equal_time,
     test_nn,
     test_ihc,
+    test_ils,
     test_sa,
     test_ts,
     test_ga,
@@ -21,8 +23,10 @@ from experiments.run_tests import (
 __all__ = [
     'run_all_tests',
     'run_multiple_times',
+    'compare_at_equal_time',
     'test_nn',
     'test_ihc',
+    'test_ils',
     'test_sa',
     'test_ts',
     'test_ga',
@@ -19,10 +19,11 @@ from datetime import datetime
 
 from algorithms.nn import nearest_neighbor
 from algorithms.ihc import iterative_hill_climbing, ihc_with_intensification
-from algorithms.sa import simulated_annealing, sa_with_reheating
-from algorithms.ts import tabu_search, tabu_search_diversification
-from algorithms.ga import genetic_algorithm, ga_adaptive_mutation
-from algorithms.aco import ant_colony_optimization, max_min_ant_system
+from algorithms.ils import iterated_local_search
+from algorithms.sa import simulated_annealing, sa_with_reheating, parallel_tempering
+from algorithms.ts import tabu_search, tabu_search_diversification, tabu_search_best_improvement
+from algorithms.ga import genetic_algorithm, ga_adaptive_mutation, island_genetic_algorithm, steady_state_ga
+from algorithms.aco import ant_colony_optimization, max_min_ant_system, ant_colony_system
 
 
 def run_multiple_times(func, n_runs=5):
@@ -56,6 +57,37 @@ def run_multiple_times(func, n_runs=5):
     }
 
 
+def compare_at_equal_time(variants, time_limit, n_runs=5):
+    """
+    Porównuje warianty algorytmów przy RÓWNYM limicie czasu.
+    
+    Args:
+        variants: lista krotek (algorithm, params, func), gdzie
+                  func(time_limit) zwraca (route, cost)
+        time_limit: limit czasu jednego uruchomienia (sekundy)
+        n_runs: liczba powtórzeń
+    
+    Returns:
+        lista słowników w formacie wierszy CSV
+    """
+    results = []
+    
+    for algorithm, params, func in variants:
+        stats = run_multiple_times(lambda f=func: f(time_limit), n_runs)
+        results.append({
+            'algorithm': algorithm,
+            'params': f'{params}, time_limit={time_limit}s',
+            'min': stats['min'],
+            'mean': stats['mean'],
+            'std': stats['std'],
+            'time': stats['mean_time'],
+            'route': stats['best_route']
+        })
+        print(f"    {algorithm} ({time_limit}s) | min={stats['min']:.2f} | mean={stats['mean']:.2f}")
+    
+    return results
+
+
 def test_nn(tsp, n_runs=5):
     """
     Testuje algorytm NN dla różnych miast startowych.
@@ -232,6 +264,98 @@ def test_ihc(tsp, n_runs=5, use_nn_start=False):
     })
     print(f"    IHC+Intensification | min={stats['min']:.2f} | mean={stats['mean']:.2f}")
     
+    # Intensyfikacja VND vs stara (losowa) przy równym czasie
+    results.extend(compare_at_equal_time([
+        ('IHC_INTENSIFICATION_RANDOM', 'iters=1000, intensification=random',
+         lambda tl: ihc_with_intensification(tsp, iterations=1000, restarts=10**6,
+                                             intensification="random", time_limit=tl)),
+        ('IHC_INTENSIFICATION_VND', 'iters=1000, intensification=vnd',
+         lambda tl: ihc_with_intensification(tsp, iterations=1000, restarts=10**6,
+                                             intensification="vnd", time_limit=tl)),
+    ], time_limit=1.0, n_runs=n_runs))
+    
+    return results
+
+
+def test_ils(tsp, n_runs=5, use_nn_start=False):
+    """
+    Testuje algorytm ILS z różnymi parametrami oraz porównuje go z IHC
+    przy równym budżecie czasu.
+    
+    Parametry testowane:
+    1. Kryterium akceptacji (3 wartości)
+    2. Liczba perturbacji (4 wartości)
+    3. Rozmiar listy kandydatów w 2-opt (4 wartości)
+    """
+    results = []
+    
+    # Parametry do testowania
+    acceptances = ["better", "always", "threshold"]
+    iterations_list = [100, 500, 1000, 2000]
+    neighbors_list = [5, 8, 10, 15]
+    
+    print("  Testowanie ILS...")
+    
+    # Parametr 1: Test kryterium akceptacji
+    for acc in acceptances:
+        stats = run_multiple_times(
+            lambda a=acc: iterated_local_search(tsp, iterations=1000, acceptance=a, use_nn_start=use_nn_start),
+            n_runs
+        )
+        results.append({
+            'algorithm': 'ILS',
+            'params': f'acceptance={acc}, iters=1000, neighbors=10',
+            'min': stats['min'],
+            'mean': stats['mean'],
+            'std': stats['std'],
+            'time': stats['mean_time'],
+            'route': stats['best_route']
+        })
+        print(f"    acceptance={acc} | min={stats['min']:.2f} | mean={stats['mean']:.2f}")
+    
+    # Parametr 2: Test liczby perturbacji
+    for iters in iterations_list:
+        stats = run_multiple_times(
+            lambda i=iters: iterated_local_search(tsp, iterations=i, use_nn_start=use_nn_start),
+            n_runs
+        )
+        results.append({
+            'algorithm': 'ILS',
+            'params': f'acceptance=better, iters={iters}, neighbors=10',
+            'min': stats['min'],
+            'mean': stats['mean'],
+            'std': stats['std'],
+            'time': stats['mean_time'],
+            'route': stats['best_route']
+        })
+        print(f"    iters={iters} | min={stats['min']:.2f} | mean={stats['mean']:.2f}")
+    
+    # Parametr 3: Test rozmiaru listy kandydatów
+    for k in neighbors_list:
+        stats = run_multiple_times(
+            lambda nb=k: iterated_local_search(tsp, iterations=1000, neighbors=nb, use_nn_start=use_nn_start),
+            n_runs
+        )
+        results.append({
+            'algorithm': 'ILS',
+            'params': f'acceptance=better, iters=1000, neighbors={k}',
+            'min': stats['min'],
+            'mean': stats['mean'],
+            'std': stats['std'],
+            'time': stats['mean_time'],
+            'route': stats['best_route']
+        })
+        print(f"    neighbors={k} | min={stats['min']:.2f} | mean={stats['mean']:.2f}")
+    
+    # Porównanie z IHC przy równym czasie
+    results.extend(compare_at_equal_time([
+        ('IHC', 'neigh=two_opt, iters=1000',
+         lambda tl: iterative_hill_climbing(tsp, iterations=1000, restarts=10**6, neighborhood="two_opt",
+                                            use_nn_start=use_nn_start, time_limit=tl)),
+        ('ILS', 'acceptance=better',
+         lambda tl: iterated_local_search(tsp, iterations=10**9, use_nn_start=use_nn_start, time_limit=tl)),
+    ], time_limit=1.0, n_runs=n_runs))
+    
     return results
 
 
@@ -334,6 +458,59 @@ def test_sa(tsp, n_runs=5, use_nn_start=False):
     })
     print(f"    SA+Reheating | min={stats['min']:.2f} | mean={stats['mean']:.2f}")
     
+    # Test trybu blokowego (NumPy) - ta sama liczba iteracji
+    stats = run_multiple_times(
+        lambda: simulated_annealing(tsp, temp=1000, alpha=0.99, iterations=5000,
+                                    neighborhood="two_opt", use_nn_start=use_nn_start, batch_size=1024),
+        n_runs
+    )
+    results.append({
+        'algorithm': 'SA_BATCHED',
+        'params': 'temp=1000, alpha=0.99, iters=5000, batch_size=1024',
+        'min': stats['min'],
+        'mean': stats['mean'],
+        'std': stats['std'],
+        'time': stats['mean_time'],
+        'route': stats['best_route']
+    })
+    print(f"    SA+Batched | min={stats['min']:.2f} | mean={stats['mean']:.2f}")
+    
+    # Test automatycznej temperatury i chłodzenia sterowanego czasem
+    for tl in [0.5, 1.0, 2.0, 4.0]:
+        stats = run_multiple_times(
+            lambda limit=tl: simulated_annealing(tsp, temp="auto", neighborhood="two_opt",
+                                                 time_limit=limit, use_nn_start=use_nn_start),
+            n_runs
+        )
+        results.append({
+            'algorithm': 'SA_AUTO_TIMED',
+            'params': f'temp=auto, target_acceptance=0.8, time_limit={tl}s',
+            'min': stats['min'],
+            'mean': stats['mean'],
+            'std': stats['std'],
+            'time': stats['mean_time'],
+            'route': stats['best_route']
+        })
+        print(f"    SA auto-T0 time_limit={tl}s | min={stats['min']:.2f} | mean={stats['mean']:.2f}")
+    
+    # Test parallel tempering - liczba replik (bez strojenia temp/alpha)
+    for n_rep in [2, 4, 8]:
+        stats = run_multiple_times(
+            lambda nr=n_rep: parallel_tempering(tsp, n_replicas=nr, neighborhood="two_opt",
+                                                use_nn_start=use_nn_start),
+            n_runs
+        )
+        results.append({
+            'algorithm': 'SA_PARALLEL_TEMPERING',
+            'params': f'replicas={n_rep}, exchange_interval=2000, exchanges=100',
+            'min': stats['min'],
+            'mean': stats['mean'],
+            'std': stats['std'],
+            'time': stats['mean_time'],
+            'route': stats['best_route']
+        })
+        print(f"    SA+ParallelTempering replicas={n_rep} | min={stats['min']:.2f} | mean={stats['mean']:.2f}")
+    
     return results
 
 
@@ -426,21 +603,59 @@ def test_ts(tsp, n_runs=5, use_nn_start=False):
         })
         print(f"    candidates={cand} | min={stats['min']:.2f} | mean={stats['mean']:.2f}")
     
-    # Test usprawnienia: TS z dywersyfikacją
-    stats = run_multiple_times(
-        lambda: tabu_search_diversification(tsp, iterations=500, tabu_size=20),
-        n_runs
-    )
-    results.append({
-        'algorithm': 'TS_DIVERSIFICATION',
-        'params': 'iters=500, tabu_size=20',
-        'min': stats['min'],
-        'mean': stats['mean'],
-        'std': stats['std'],
-        'time': stats['mean_time'],
-        'route': stats['best_route']
-    })
-    print(f"    TS+Diversification | min={stats['min']:.2f} | mean={stats['mean']:.2f}")
+    # Test rodzaju pamięci tabu (atrybutowa vs stara - całe trasy)
+    for tabu_type in ["attribute", "solution"]:
+        stats = run_multiple_times(
+            lambda tt=tabu_type: tabu_search(tsp, iterations=500, tabu_size=20, neighborhood="two_opt",
+                                             use_nn_start=use_nn_start, tabu_type=tt),
+            n_runs
+        )
+        results.append({
+            'algorithm': 'TS',
+            'params': f'neigh=two_opt, iters=500, tabu_size=20, tabu_type={tabu_type}',
+            'min': stats['min'],
+            'mean': stats['mean'],
+            'std': stats['std'],
+            'time': stats['mean_time'],
+            'route': stats['best_route']
+        })
+        print(f"    tabu_type={tabu_type} | min={stats['min']:.2f} | mean={stats['mean']:.2f}")
+    
+    # Test usprawnienia: best-improvement (pełne sąsiedztwo, macierz wartości ruchów)
+    for neigh in ["swap", "two_opt"]:
+        stats = run_multiple_times(
+            lambda n=neigh: tabu_search_best_improvement(tsp, iterations=500, tabu_size=20, neighborhood=n,
+                                                         use_nn_start=use_nn_start),
+            n_runs
+        )
+        results.append({
+            'algorithm': 'TS_BEST_IMPROVEMENT',
+            'params': f'neigh={neigh}, iters=500, tabu_size=20',
+            'min': stats['min'],
+            'mean': stats['mean'],
+            'std': stats['std'],
+            'time': stats['mean_time'],
+            'route': stats['best_route']
+        })
+        print(f"    best-improvement neigh={neigh} | min={stats['min']:.2f} | mean={stats['mean']:.2f}")
+    
+    # Test usprawnienia: TS z dywersyfikacją (losowe zamiany vs pamięć długoterminowa)
+    for diversification in ["random", "frequency"]:
+        stats = run_multiple_times(
+            lambda dv=diversification: tabu_search_diversification(tsp, iterations=500, tabu_size=20,
+                                                                   diversification=dv),
+            n_runs
+        )
+        results.append({
+            'algorithm': 'TS_DIVERSIFICATION',
+            'params': f'iters=500, tabu_size=20, diversification={diversification}',
+            'min': stats['min'],
+            'mean': stats['mean'],
+            'std': stats['std'],
+            'time': stats['mean_time'],
+            'route': stats['best_route']
+        })
+        print(f"    TS+Diversification ({diversification}) | min={stats['min']:.2f} | mean={stats['mean']:.2f}")
     
     return results
 
@@ -453,7 +668,7 @@ def test_ga(tsp, n_runs=5, use_nn_start=False):
     
     # Parametry do testowania
     selection_types = ["tournament", "roulette", "ranking"]
-    crossover_types = ["ox", "pmx", "cx"]
+    crossover_types = ["ox", "pmx", "cx", "erx", "eax"]
     mutation_types = ["swap", "insert", "inversion"]
     pop_sizes = [50, 100, 150, 200]
     mutation_probs = [0.01, 0.05, 0.1, 0.2]
@@ -552,21 +767,81 @@ def test_ga(tsp, n_runs=5, use_nn_start=False):
         })
         print(f"    p_mut={p_mut} | min={stats['min']:.2f} | mean={stats['mean']:.2f}")
     
-    # Test usprawnienia: GA z adaptacyjną mutacją
+    # Test usprawnienia: GA z adaptacyjną mutacją (różne miary różnorodności)
+    for measure in ["edges", "entropy", "pairwise"]:
+        stats = run_multiple_times(
+            lambda dm=measure: ga_adaptive_mutation(tsp, pop_size=100, generations=100,
+                                                    use_nn_start=use_nn_start, diversity_measure=dm),
+            n_runs
+        )
+        results.append({
+            'algorithm': 'GA_ADAPTIVE',
+            'params': f'pop=100, gen=100, adaptive_mutation, diversity={measure}',
+            'min': stats['min'],
+            'mean': stats['mean'],
+            'std': stats['std'],
+            'time': stats['mean_time'],
+            'route': stats['best_route']
+        })
+        print(f"    GA+AdaptiveMutation ({measure}) | min={stats['min']:.2f} | mean={stats['mean']:.2f}")
+    
+    # Test usprawnienia: model wyspowy (4 wyspy x 25 = ta sama łączna populacja)
     stats = run_multiple_times(
-        lambda: ga_adaptive_mutation(tsp, pop_size=100, generations=100, use_nn_start=use_nn_start),
+        lambda: island_genetic_algorithm(tsp, n_islands=4, island_size=25, generations=100,
+                                         migration_interval=10, migration_size=2,
+                                         use_nn_start=use_nn_start),
         n_runs
     )
     results.append({
-        'algorithm': 'GA_ADAPTIVE',
-        'params': 'pop=100, gen=100, adaptive_mutation',
+        'algorithm': 'GA_ISLANDS',
+        'params': 'islands=4x25, gen=100, migration=2/10 best-worst',
         'min': stats['min'],
         'mean': stats['mean'],
         'std': stats['std'],
         'time': stats['mean_time'],
         'route': stats['best_route']
     })
-    print(f"    GA+AdaptiveMutation | min={stats['min']:.2f} | mean={stats['mean']:.2f}")
+    print(f"    GA+Islands | min={stats['min']:.2f} | mean={stats['mean']:.2f}")
+    
+    # Test usprawnienia: GA memetyczny (mała populacja + 2-opt / Or-opt na dzieciach)
+    for local_search in ["two_opt", "both"]:
+        stats = run_multiple_times(
+            lambda ls=local_search: genetic_algorithm(tsp, pop_size=20, generations=30, local_search=ls,
+                                                      ls_budget=2000, use_nn_start=use_nn_start),
+            n_runs
+        )
+        results.append({
+            'algorithm': 'GA_MEMETIC',
+            'params': f'pop=20, gen=30, local_search={local_search}, ls_budget=2000',
+            'min': stats['min'],
+            'mean': stats['mean'],
+            'std': stats['std'],
+            'time': stats['mean_time'],
+            'route': stats['best_route']
+        })
+        print(f"    GA+Memetic ({local_search}) | min={stats['min']:.2f} | mean={stats['mean']:.2f}")
+    
+    # Test usprawnienia: GA stacjonarny - tyle samo ocen co pokolenia 100 x 100
+    stats = run_multiple_times(
+        lambda: steady_state_ga(tsp, pop_size=100, offspring=10000, use_nn_start=use_nn_start),
+        n_runs
+    )
+    results.append({
+        'algorithm': 'GA_STEADY_STATE',
+        'params': 'pop=100, offspring=10000, replace-worst, no duplicates',
+        'min': stats['min'],
+        'mean': stats['mean'],
+        'std': stats['std'],
+        'time': stats['mean_time'],
+        'route': stats['best_route']
+    })
+    print(f"    GA+SteadyState | min={stats['min']:.2f} | mean={stats['mean']:.2f}")
+    
+    # Oszczędność ocen: dziedziczone koszty, delty mutacji, pamięć hasz -> koszt
+    eval_stats = {}
+    genetic_algorithm(tsp, pop_size=100, generations=100, use_nn_start=use_nn_start, stats=eval_stats)
+    print(f"    Ocen pełnych: {eval_stats['evaluations']} | delta: {eval_stats['delta_evaluations']} | "
+          f"z pamięci: {eval_stats['cache_hits']} | zaoszczędzone: {eval_stats['saved_fraction']:.1%}")
     
     return results
 
@@ -602,6 +877,24 @@ def test_aco(tsp, n_runs=5):
         })
         print(f"    n_ants={n_ants} | min={stats['min']:.2f} | mean={stats['mean']:.2f}")
     
+    # Test usprawnienia: konstrukcja tras wszystkich mrówek naraz (lockstep)
+    for n_ants in [20, 50]:
+        stats = run_multiple_times(
+            lambda na=n_ants: ant_colony_optimization(tsp, n_ants=na, n_iterations=50, lockstep=True),
+            n_runs
+        )
+        results.append({
+            'algorithm': 'ACO_LOCKSTEP',
+            'params': f'n_ants={n_ants}, iters=50, alpha=1, beta=2, lockstep',
+            'min': stats['min'],
+            'mean': stats['mean'],
+            'std': stats['std'],
+            'time': stats['mean_time'],
+            'route': stats['best_route']
+        })
+        print(f"    n_ants={n_ants} (lockstep) | min={stats['min']:.2f} | mean={stats['mean']:.2f} | "
+              f"czas={stats['mean_time']:.2f}s")
+    
     # Test parametru alpha (wpływ feromonów)
     for alpha in alphas:
         stats = run_multiple_times(
@@ -669,6 +962,45 @@ def test_aco(tsp, n_runs=5):
     })
     print(f"    MMAS | min={stats['min']:.2f} | mean={stats['mean']:.2f}")
     
+    # Test usprawnienia: MMAS z restartem feromonów przy stagnacji
+    stats = run_multiple_times(
+        lambda: max_min_ant_system(tsp, n_ants=20, n_iterations=300, stagnation="no_improve",
+                                   stagnation_limit=100),
+        n_runs
+    )
+    results.append({
+        'algorithm': 'MMAS_RESTART',
+        'params': 'n_ants=20, iters<=300, no_improve=100, max_restarts=3',
+        'min': stats['min'],
+        'mean': stats['mean'],
+        'std': stats['std'],
+        'time': stats['mean_time'],
+        'route': stats['best_route']
+    })
+    print(f"    MMAS+Restart | min={stats['min']:.2f} | mean={stats['mean']:.2f}")
+    restart_stats = {}
+    max_min_ant_system(tsp, n_ants=20, n_iterations=300, stagnation="no_improve",
+                       stagnation_limit=100, stats=restart_stats)
+    print(f"    Iteracji: {restart_stats['iterations']} | restarty: {restart_stats['restart_iterations']} | "
+          f"najlepsza w iteracji: {restart_stats['best_iteration']} | "
+          f"wcześniejszy koniec: {restart_stats['terminated_early']}")
+    
+    # Test usprawnienia: Ant Colony System (reguła q0, lokalna aktualizacja)
+    stats = run_multiple_times(
+        lambda: ant_colony_system(tsp, n_ants=10, n_iterations=100),
+        n_runs
+    )
+    results.append({
+        'algorithm': 'ACS',
+        'params': 'n_ants=10, iters=100, q0=0.9, xi=0.1, rho=0.1, neighbors=15',
+        'min': stats['min'],
+        'mean': stats['mean'],
+        'std': stats['std'],
+        'time': stats['mean_time'],
+        'route': stats['best_route']
+    })
+    print(f"    ACS | min={stats['min']:.2f} | mean={stats['mean']:.2f}")
+    
     return results
 
 
@@ -686,22 +1018,25 @@ def run_all_tests(tsp, instance_name, n_runs=5, output_dir="results", use_nn_sta
     all_results = []
     
     # Uruchom testy dla każdego algorytmu
-    print("\n[1/6] Algorytm NN (Nearest Neighbor)")
+    print("\n[1/7] Algorytm NN (Nearest Neighbor)")
     all_results.extend(test_nn(tsp, n_runs=1))  # NN deterministyczny
     
-    print("\n[2/6] Algorytm IHC (Iterative Hill Climbing)")
+    print("\n[2/7] Algorytm IHC (Iterative Hill Climbing)")
     all_results.extend(test_ihc(tsp, n_runs, use_nn_start=use_nn_start))
     
-    print("\n[3/6] Algorytm SA (Simulated Annealing)")
+    print("\n[3/7] Algorytm ILS (Iterated Local Search)")
+    all_results.extend(test_ils(tsp, n_runs, use_nn_start=use_nn_start))
+    
+    print("\n[4/7] Algorytm SA (Simulated Annealing)")
     all_results.extend(test_sa(tsp, n_runs, use_nn_start=use_nn_start))
     
-    print("\n[4/6] Algorytm TS (Tabu Search)")
+    print("\n[5/7] Algorytm TS (Tabu Search)")
     all_results.extend(test_ts(tsp, n_runs, use_nn_start=use_nn_start))
     
-    print("\n[5/6] Algorytm GA (Genetic Algorithm)")
+    print("\n[6/7] Algorytm GA (Genetic Algorithm)")
     all_results.extend(test_ga(tsp, n_runs, use_nn_start=use_nn_start))
     
-    print("\n[6/6] Algorytm ACO (Ant Colony Optimization)")
+    print("\n[7/7] Algorytm ACO (Ant Colony Optimization)")
     all_results.extend(test_aco(tsp, n_runs))
     
     # Zapisz wyniki do CSV
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""
+Testy selekcji turniejowej GA.
+"""
+import random
+import numpy as np
+import pytest
+
+from utils import TSP
+from algorithms.ga import (
+    genetic_algorithm, steady_state_ga, island_genetic_algorithm, _tournament_indices,
+    tournament_selection, roulette_selection, ranking_selection
+)
+
+
+def _small_tsp(n=20, seed=0):
+    rng = random.Random(seed)
+    return TSP([(rng.uniform(0, 100), rng.uniform(0, 100)) for _ in range(n)])
+
+
+def test_tournament_size_equal_to_population_picks_best():
+    # Turniej obejmujący całą populację musi zawsze wygrać najlepszy osobnik
+    rng = np.random.default_rng(0)
+    for pop_size in (2, 10, 16, 20, 50):
+        costs = rng.random(pop_size)
+        winners = _tournament_indices(costs, 2 * pop_size, rng, k=pop_size)
+        assert (winners == np.argmin(costs)).all()
+
+
+def test_tournament_contestants_are_distinct():
+    # k = pop_size - 1 różnych osobników: wygrywa 0, a gdy go brak - 1
+    rng = np.random.default_rng(1)
+    costs = np.arange(12, dtype=float)
+    winners = _tournament_indices(costs, 1000, rng, k=11)
+    assert set(winners.tolist()) <= {0, 1}
+
+
+def test_ga_with_tournament_size_equal_to_population():
+    tsp = _small_tsp()
+    route, cost = genetic_algorithm(tsp, pop_size=20, generations=20,
+                                    tournament_size=20, selection_type="tournament")
+    assert sorted(route) == list(range(tsp.n))
+    assert abs(tsp.route_length(route) - cost) < 1e-6
+
+
+def test_ga_engines_on_one_and_two_cities():
+    for points in ([(0, 0)], [(0, 0), (3, 4)]):
+        tsp = TSP(points)
+        for route, length in (
+            genetic_algorithm(tsp, pop_size=6, generations=5, p_mut=1.0),
+            steady_state_ga(tsp, pop_size=6, offspring=20, p_mut=1.0),
+            island_genetic_algorithm(tsp, n_islands=2, island_size=4, generations=4,
+                                     migration_interval=2, p_mut=1.0, parallel=False),
+        ):
+            assert sorted(route) == list(range(tsp.n))
+            assert abs(length - tsp.route_length(route)) < 1e-9
+
+
+@pytest.mark.parametrize('select', [tournament_selection, roulette_selection, ranking_selection])
+def test_public_selection_returns_copy_for_numpy_population(select):
+    pop = np.array([[0, 1, 2, 3], [1, 0, 2, 3], [2, 1, 0, 3]])
+    snapshot = pop.copy()
+    parent = select(pop, [10.0, 20.0, 30.0])
+    parent[:] = -1
+    assert np.array_equal(pop, snapshot)
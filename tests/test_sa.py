@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""
+Testy szacowania temperatury początkowej SA.
+"""
+import random
+
+import pytest
+
+from utils import TSP
+from algorithms.sa import (
+    estimate_initial_temperature, simulated_annealing, sa_with_reheating, parallel_tempering
+)
+
+
+@pytest.mark.parametrize("target", [0.0, -0.5, 1.0, 1.5])
+def test_estimate_initial_temperature_rejects_invalid_acceptance(target):
+    tsp = TSP([(0, 0), (3, 4), (6, 0), (3, -4), (1, 1)])
+    with pytest.raises(ValueError):
+        estimate_initial_temperature(tsp, list(range(tsp.n)), target_acceptance=target)
+
+
+def test_estimate_initial_temperature_is_positive():
+    tsp = TSP([(0, 0), (3, 4), (6, 0), (3, -4), (1, 1)])
+    assert estimate_initial_temperature(tsp, list(range(tsp.n)), target_acceptance=0.8) > 0
+
+
+@pytest.mark.parametrize("points", [[(0, 0)], [(0, 0), (3, 4)]])
+@pytest.mark.parametrize("engine", [
+    lambda tsp: simulated_annealing(tsp),
+    lambda tsp: simulated_annealing(tsp, time_limit=0.01),
+    lambda tsp: sa_with_reheating(tsp),
+    lambda tsp: parallel_tempering(tsp, processes=1),
+])
+def test_sa_engines_on_one_and_two_cities(points, engine):
+    tsp = TSP(points)
+    route, length = engine(tsp)
+    assert sorted(route) == list(range(tsp.n))
+    assert abs(length - tsp.route_length(route)) < 1e-9
+
+
+def test_parallel_tempering_in_process_keeps_caller_random_stream():
+    rng = random.Random(1)
+    tsp = TSP([(rng.uniform(0, 100), rng.uniform(0, 100)) for _ in range(20)])
+    random.seed(42)
+    serial = parallel_tempering(tsp, n_replicas=3, exchange_interval=100, n_exchanges=3, processes=1)
+    after_serial = random.random()
+    random.seed(42)
+    pooled = parallel_tempering(tsp, n_replicas=3, exchange_interval=100, n_exchanges=3, processes=3)
+    after_pooled = random.random()
+    assert serial == pooled
+    assert after_serial == after_pooled
+
+
+def test_parallel_tempering_with_coincident_cities():
+    tsp = TSP([(1.0, 1.0)] * 4)
+    route, cost = parallel_tempering(tsp, n_replicas=3, exchange_interval=20, n_exchanges=2, processes=1)
+    assert sorted(route) == [0, 1, 2, 3]
+    assert cost == 0.0
@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+"""
+Testy VND i ruchów swap na bardzo małych instancjach.
+"""
+import numpy as np
+
+from utils import TSP
+from utils.neighborhoods import swap_move_delta, swap_move_delta_batch
+from algorithms.vnd import variable_neighborhood_descent
+from algorithms.ihc import ihc_with_intensification
+
+
+def test_swap_delta_on_two_cities_is_zero():
+    tsp = TSP([(0, 0), (3, 4)])
+    assert swap_move_delta([0, 1], tsp.dist_matrix, 0, 1) == 0.0
+    assert swap_move_delta_batch(np.array([0, 1]), tsp.dist_array, 0, 1) == 0.0
+
+
+def test_vnd_terminates_on_tiny_instances():
+    for points in ([(0, 0), (3, 4)], [(0, 0), (3, 4), (6, 0)]):
+        tsp = TSP(points)
+        route, length = variable_neighborhood_descent(tsp, list(range(tsp.n)))
+        assert sorted(route) == list(range(tsp.n))
+        assert abs(length - tsp.route_length(route)) < 1e-9
+
+
+def test_ihc_with_intensification_on_two_cities():
+    tsp = TSP([(0, 0), (3, 4)])
+    route, length = ihc_with_intensification(tsp)
+    assert sorted(route) == [0, 1]
+    assert abs(length - 10.0) < 1e-9
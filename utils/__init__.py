@@ -7,20 +7,29 @@ Zawiera:
 - tsp: klasa TSP z macierzą odległości
 - neighborhoods: funkcje sąsiedztwa (swap, insert, two_opt)
 - metrics: metryki i funkcje pomocnicze
+- zobrist: haszowanie tras (XOR kluczy krawędzi, aktualizacja O(1))
 """
 
 from utils.loader import load_tsp_file
 from utils.tsp import TSP
+from utils.zobrist import ZobristHash
 from utils.neighborhoods import (
     swap, insert, two_opt,
     swap_delta, insert_delta, two_opt_delta,
-    NEIGHBORHOODS, NEIGHBORHOODS_DELTA
+    swap_move_delta, insert_move_delta, two_opt_move_delta, sample_move,
+    apply_swap, apply_insert, apply_two_opt,
+    swap_move_edges, insert_move_edges, two_opt_move_edges,
+    NEIGHBORHOODS, NEIGHBORHOODS_DELTA, MOVE_DELTA, APPLY_MOVE, MOVE_EDGES
 )
 
 __all__ = [
     'load_tsp_file',
     'TSP',
+    'ZobristHash',
     'swap', 'insert', 'two_opt',
     'swap_delta', 'insert_delta', 'two_opt_delta',
-    'NEIGHBORHOODS', 'NEIGHBORHOODS_DELTA',
+    'swap_move_delta', 'insert_move_delta', 'two_opt_move_delta', 'sample_move',
+    'apply_swap', 'apply_insert', 'apply_two_opt',
+    'swap_move_edges', 'insert_move_edges', 'two_opt_move_edges',
+    'NEIGHBORHOODS', 'NEIGHBORHOODS_DELTA', 'MOVE_DELTA', 'APPLY_MOVE', 'MOVE_EDGES',
 ]
@@ -8,6 +8,7 @@ Moduł zawierający trzy rodzaje ruchów (sąsiedztw) dla algorytmów TSP:
 Każda funkcja zwraca nową trasę (nie modyfikuje oryginalnej).
 """
 import random
+import numpy as np
 
 
 def swap(route):
@@ -107,19 +108,18 @@ def insert_delta(route, tsp):
     INSERT z szybką oceną przyrostową (delta evaluation).
     Zwraca (nowa_trasa, zmiana_kosztu).
     
-    NAPRAWIONO: Obliczenia delty oparte na bezpośrednim porównaniu tras.
+    Delta liczona w O(1) przez insert_move_delta (3 krawędzie usunięte,
+    3 dodane) zamiast dwukrotnego przeliczania całej trasy.
     """
     n = len(route)
     if n < 2:
         return route[:], 0.0
     
-    # Generuj nową trasę
-    new_route = insert(route)
+    a, b = random.sample(range(n), 2)
+    delta = insert_move_delta(route, tsp.dist_matrix, a, b)
     
-    # Oblicz deltę jako różnicę kosztów
-    old_cost = tsp.route_length(route)
-    new_cost = tsp.route_length(new_route)
-    delta = new_cost - old_cost
+    new_route = route[:]
+    apply_insert(new_route, a, b)
     
     return new_route, delta
 
@@ -157,6 +157,290 @@ def two_opt_delta(route, tsp):
     return new_route, delta
 
 
+# ============ RUCHY O ZADANYCH INDEKSACH (O(1) delta, zmiana w miejscu) ============
+# Funkcje *_move_delta tylko oceniają ruch (nie kopiują trasy), a apply_*
+# wykonują go na istniejącej liście. Pozwala to przeglądać sąsiedztwo
+# wyczerpująco (VND) i materializować tylko zaakceptowane ruchy.
+
+def swap_move_delta(route, dm, a, b):
+    """
+    Zmiana kosztu po zamianie miast na pozycjach a i b (a != b). O(1).
+    """
+    n = len(route)
+    if n == 2:  # Obie krawędzie to (a, b) - zamiana nie zmienia trasy
+        return 0.0
+    if a > b:
+        a, b = b, a
+    city_a = route[a]
+    city_b = route[b]
+    
+    if b == a + 1:  # sąsiednie miasta
+        prev = route[a - 1]
+        nxt = route[(b + 1) % n]
+        old_cost = dm[prev][city_a] + dm[city_b][nxt]
+        new_cost = dm[prev][city_b] + dm[city_a][nxt]
+    elif a == 0 and b == n - 1:  # pierwszy i ostatni (sąsiedzi w cyklu)
+        prev = route[n - 2]
+        nxt = route[1]
+        old_cost = dm[prev][city_b] + dm[city_a][nxt]
+        new_cost = dm[prev][city_a] + dm[city_b][nxt]
+    else:
+        a_prev = route[a - 1]
+        a_next = route[a + 1]
+        b_prev = route[b - 1]
+        b_next = route[(b + 1) % n]
+        old_cost = (dm[a_prev][city_a] + dm[city_a][a_next] +
+                    dm[b_prev][city_b] + dm[city_b][b_next])
+        new_cost = (dm[a_prev][city_b] + dm[city_b][a_next] +
+                    dm[b_prev][city_a] + dm[city_a][b_next])
+    
+    return new_cost - old_cost
+
+
+def insert_move_delta(route, dm, a, b):
+    """
+    Zmiana kosztu po wyjęciu miasta z pozycji a i wstawieniu go na pozycję b
+    (semantyka list.pop(a) + list.insert(b, ...)). O(1).
+    """
+    n = len(route)
+    city = route[a]
+    prev = route[a - 1]
+    nxt = route[(a + 1) % n]
+    
+    # Krawędź (x, y), w którą wstawiamy miasto - w trasie bez miasta
+    if b > a:
+        x = route[b]
+        y = route[(b + 1) % n]
+        if y == city:
+            y = nxt
+    else:
+        x = route[b - 1]
+        y = route[b]
+        if x == city:
+            x = prev
+    
+    removed = dm[prev][city] + dm[city][nxt] - dm[prev][nxt]
+    added = dm[x][city] + dm[city][y] - dm[x][y]
+    return added - removed
+
+
+def two_opt_move_delta(route, dm, a, b):
+    """
+    Zmiana kosztu po odwróceniu fragmentu route[a:b] (0 <= a < b <= n). O(1).
+    """
+    n = len(route)
+    if b - a < 2 or b - a >= n - 1:  # brak zmiany cyklu
+        return 0.0
+    
+    A = route[a - 1]
+    B = route[a]
+    C = route[b - 1]
+    D = route[b % n]
+    
+    return dm[A][C] + dm[B][D] - dm[A][B] - dm[C][D]
+
+
+def swap_move_edges(route, a, b):
+    """
+    Krawędzie usuwane i dodawane przez SWAP pozycji a i b.
+    Zwraca (usunięte, dodane) - listy par miast.
+    """
+    n = len(route)
+    if a > b:
+        a, b = b, a
+    city_a = route[a]
+    city_b = route[b]
+    
+    if b == a + 1:  # sąsiednie miasta - krawędź (city_a, city_b) zostaje
+        prev = route[a - 1]
+        nxt = route[(b + 1) % n]
+        return [(prev, city_a), (city_b, nxt)], [(prev, city_b), (city_a, nxt)]
+    if a == 0 and b == n - 1:  # pierwszy i ostatni
+        prev = route[n - 2]
+        nxt = route[1]
+        return [(prev, city_b), (city_a, nxt)], [(prev, city_a), (city_b, nxt)]
+    
+    a_prev = route[a - 1]
+    a_next = route[a + 1]
+    b_prev = route[b - 1]
+    b_next = route[(b + 1) % n]
+    removed = [(a_prev, city_a), (city_a, a_next), (b_prev, city_b), (city_b, b_next)]
+    added = [(a_prev, city_b), (city_b, a_next), (b_prev, city_a), (city_a, b_next)]
+    
+    # Jedno wspólne miasto między a i b - jego krawędzie tylko zmieniają stronę
+    if a_next == b_prev:
+        del removed[1:3], added[1:3]
+    elif b_next == a_prev:
+        del removed[0], removed[-1], added[0], added[-1]
+    return removed, added
+
+
+def insert_move_edges(route, a, b):
+    """
+    Krawędzie usuwane i dodawane przez INSERT (miasto z pozycji a na b).
+    Zwraca (usunięte, dodane) - listy par miast.
+    """
+    n = len(route)
+    city = route[a]
+    prev = route[a - 1]
+    nxt = route[(a + 1) % n]
+    
+    if b > a:
+        x = route[b]
+        y = route[(b + 1) % n]
+        if y == city:
+            y = nxt
+    else:
+        x = route[b - 1]
+        y = route[b]
+        if x == city:
+            x = prev
+    
+    if x == prev and y == nxt:  # obrót trasy - ten sam cykl
+        return [], []
+    if x == nxt:  # przesunięcie o jedną pozycję do przodu
+        return [(prev, city), (nxt, y)], [(prev, nxt), (city, y)]
+    if y == prev:  # przesunięcie o jedną pozycję do tyłu
+        return [(x, prev), (city, nxt)], [(x, city), (prev, nxt)]
+    
+    return [(prev, city), (city, nxt), (x, y)], [(prev, nxt), (x, city), (city, y)]
+
+
+def two_opt_move_edges(route, a, b):
+    """
+    Krawędzie usuwane i dodawane przez odwrócenie route[a:b].
+    Zwraca (usunięte, dodane) - listy par miast.
+    """
+    n = len(route)
+    if b - a < 2 or b - a >= n - 1:  # brak zmiany cyklu
+        return [], []
+    
+    A = route[a - 1]
+    B = route[a]
+    C = route[b - 1]
+    D = route[b % n]
+    return [(A, B), (C, D)], [(A, C), (B, D)]
+
+
+def sample_move(n, neighborhood, rng=random):
+    """
+    Losuje pozycje (a, b) ruchu z takim samym rozkładem jak funkcje
+    swap / insert / two_opt (bez kopiowania trasy).
+    
+    rng: źródło losowości (moduł random albo własny random.Random)
+    """
+    a, b = rng.sample(range(n), 2)
+    if neighborhood == "two_opt":
+        if a > b:
+            a, b = b, a
+        if b - a < 2:  # za krótki fragment
+            b = min(a + 2, n)
+    return a, b
+
+
+def apply_swap(route, a, b):
+    """Wykonuje SWAP na pozycjach a i b w miejscu."""
+    route[a], route[b] = route[b], route[a]
+
+
+def apply_insert(route, a, b):
+    """Wykonuje INSERT (miasto z pozycji a na pozycję b) w miejscu."""
+    route.insert(b, route.pop(a))
+
+
+def apply_two_opt(route, a, b):
+    """Odwraca fragment route[a:b] w miejscu."""
+    route[a:b] = route[a:b][::-1]
+
+
+# ============ WERSJE WEKTOROWE (NumPy, bloki ruchów) ============
+# Ocena całego bloku ruchów (tablice pozycji a, b) względem jednej trasy
+# zapisanej jako np.ndarray. Wyniki są zgodne z *_move_delta.
+# Zakładamy zerową przekątną macierzy odległości (D[i][i] = 0).
+
+def sample_moves_batch(rng, n, neighborhood, size):
+    """
+    Losuje blok `size` ruchów (tablice a, b) z rozkładem jak sample_move.
+    
+    Args:
+        rng: generator np.random.Generator
+    """
+    a = rng.integers(0, n, size)
+    b = rng.integers(0, n - 1, size)
+    b += b >= a  # para różnych pozycji, równomiernie
+    if neighborhood == "two_opt":
+        a, b = np.minimum(a, b), np.maximum(a, b)
+        b = np.where(b - a < 2, np.minimum(a + 2, n), b)
+    return a, b
+
+
+def swap_move_delta_batch(route, D, a, b):
+    """Wektorowa wersja swap_move_delta."""
+    n = len(route)
+    if n == 2:
+        return np.zeros(np.broadcast(a, b).shape)
+    a, b = np.minimum(a, b), np.maximum(a, b)
+    ca = route[a]
+    cb = route[b]
+    a_prev = route[a - 1]
+    a_next = route[(a + 1) % n]
+    b_prev = route[b - 1]
+    b_next = route[(b + 1) % n]
+    
+    delta = (D[a_prev, cb] + D[cb, a_next] + D[b_prev, ca] + D[ca, b_next]
+             - D[a_prev, ca] - D[ca, a_next] - D[b_prev, cb] - D[cb, b_next])
+    
+    # Sąsiednie miasta (także pierwsze i ostatnie): wzór ogólny dwukrotnie
+    # odejmuje krawędź (ca, cb), która w rzeczywistości zostaje
+    adjacent = (b == a + 1) | ((a == 0) & (b == n - 1))
+    return delta + np.where(adjacent, 2 * D[ca, cb], 0.0)
+
+
+def insert_move_delta_batch(route, D, a, b):
+    """Wektorowa wersja insert_move_delta."""
+    n = len(route)
+    city = route[a]
+    prev = route[a - 1]
+    nxt = route[(a + 1) % n]
+    
+    forward = b > a
+    x = np.where(forward, route[b], route[b - 1])
+    y = np.where(forward, route[(b + 1) % n], route[b])
+    y = np.where(forward & (y == city), nxt, y)
+    x = np.where(~forward & (x == city), prev, x)
+    
+    removed = D[prev, city] + D[city, nxt] - D[prev, nxt]
+    added = D[x, city] + D[city, y] - D[x, y]
+    return added - removed
+
+
+def two_opt_move_delta_batch(route, D, a, b):
+    """Wektorowa wersja two_opt_move_delta (a < b)."""
+    n = len(route)
+    A = route[a - 1]
+    B = route[a]
+    C = route[b - 1]
+    E = route[b % n]
+    
+    delta = D[A, C] + D[B, E] - D[A, B] - D[C, E]
+    return np.where((b - a < 2) | (b - a >= n - 1), 0.0, delta)
+
+
+def apply_move_array(route, neighborhood, a, b):
+    """Wykonuje ruch w miejscu na trasie zapisanej jako np.ndarray."""
+    if neighborhood == "swap":
+        route[a], route[b] = route[b], route[a]
+    elif neighborhood == "insert":
+        city = route[a]
+        if a < b:
+            route[a:b] = route[a + 1:b + 1].copy()
+        else:
+            route[b + 1:a + 1] = route[b:a].copy()
+        route[b] = city
+    else:
+        route[a:b] = route[a:b][::-1].copy()
+
+
 # ============ SŁOWNIK SĄSIEDZTW ============
 
 NEIGHBORHOODS = {
@@ -170,3 +454,27 @@ NEIGHBORHOODS_DELTA = {
     "insert": insert_delta,
     "two_opt": two_opt_delta
 }
+
+MOVE_DELTA = {
+    "swap": swap_move_delta,
+    "insert": insert_move_delta,
+    "two_opt": two_opt_move_delta
+}
+
+APPLY_MOVE = {
+    "swap": apply_swap,
+    "insert": apply_insert,
+    "two_opt": apply_two_opt
+}
+
+MOVE_EDGES = {
+    "swap": swap_move_edges,
+    "insert": insert_move_edges,
+    "two_opt": two_opt_move_edges
+}
+
+MOVE_DELTA_BATCH = {
+    "swap": swap_move_delta_batch,
+    "insert": insert_move_delta_batch,
+    "two_opt": two_opt_move_delta_batch
+}
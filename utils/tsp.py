@@ -6,6 +6,7 @@ Przechowuje współrzędne miast i oblicza macierz odległości.
 Służy jako kontener danych dla wszystkich algorytmów.
 """
 import math
+import numpy as np
 
 
 class TSP:
@@ -34,6 +35,9 @@ class TSP:
             self.coords = data
             self.n = len(data)
             self.dist_matrix = self._compute_dist_matrix()
+        
+        self._neighbor_lists = {}  # Pamięć podręczna list kandydatów (k -> listy)
+        self._dist_array = None  # Macierz odległości jako np.ndarray (leniwie)
 
     def _compute_dist_matrix(self):
         """
@@ -54,6 +58,17 @@ class TSP:
                 mat[i][j] = math.hypot(x1 - x2, y1 - y2)
         return mat
 
+    @property
+    def dist_array(self):
+        """
+        Macierz odległości jako tablica NumPy (float64, n x n).
+        
+        Tworzona przy pierwszym użyciu - dla algorytmów wektorowych.
+        """
+        if self._dist_array is None:
+            self._dist_array = np.array(self.dist_matrix, dtype=float)
+        return self._dist_array
+
     def route_length(self, route):
         """
         Oblicza całkowitą długość trasy (cyklu).
@@ -71,3 +86,36 @@ class TSP:
             b = route[(i + 1) % len(route)]  # Następne miasto (% zapewnia powrót)
             total += self.dist_matrix[a][b]
         return total
+
+    def route_lengths(self, routes):
+        """
+        Długości wielu tras naraz (wektorowo).
+        
+        Args:
+            routes: tablica NumPy (m x n) - każdy wiersz to trasa
+        
+        Returns:
+            np.ndarray (m,) długości tras - jeden gather po macierzy odległości
+        """
+        return self.dist_array[routes, np.roll(routes, -1, axis=1)].sum(axis=1)
+
+    def neighbor_lists(self, k=10):
+        """
+        Listy k najbliższych sąsiadów każdego miasta (lista kandydatów).
+        
+        Obliczane raz dla danego k i zapamiętywane.
+        
+        Args:
+            k: liczba sąsiadów na miasto
+        
+        Returns:
+            lista list: neighbors[i] = k najbliższych miast do i (rosnąco)
+        """
+        k = min(k, self.n - 1)
+        if k not in self._neighbor_lists:
+            self._neighbor_lists[k] = [
+                sorted((j for j in range(self.n) if j != i),
+                       key=lambda j: self.dist_matrix[i][j])[:k]
+                for i in range(self.n)
+            ]
+        return self._neighbor_lists[k]
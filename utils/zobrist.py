@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""
+Haszowanie tras metodą Zobrista.
+
+Każda nieskierowana krawędź (i, j) dostaje losowy 64-bitowy klucz, a hasz
+trasy to XOR kluczy wszystkich jej krawędzi. Dzięki temu:
+- ta sama trasa ma ten sam hasz niezależnie od miasta startowego i kierunku,
+- po ruchu swap / insert / two_opt hasz aktualizujemy w O(1), XOR-ując
+  klucze krawędzi usuniętych i dodanych (MOVE_EDGES z neighborhoods.py).
+
+Służy do rozpoznawania odwiedzonych tras (lista tabu, duplikaty w GA)
+bez porównywania całych n-elementowych krotek.
+"""
+import random
+import numpy as np
+
+
+class ZobristHash:
+    """
+    Klucze Zobrista dla krawędzi instancji z n miastami.
+
+    Attributes:
+        keys: macierz n x n losowych kluczy 64-bit (symetryczna)
+    """
+
+    def __init__(self, n, seed=None):
+        """
+        Args:
+            n: liczba miast
+            seed: ziarno generatora kluczy (None = losowe)
+        """
+        rng = random.Random(seed)
+        self.keys = [[0] * n for _ in range(n)]
+        for i in range(n):
+            for j in range(i + 1, n):
+                self.keys[i][j] = self.keys[j][i] = rng.getrandbits(64)
+        self._key_array = None  # Klucze jako np.ndarray (leniwie)
+
+    def tour_hash(self, route):
+        """Hasz całej trasy - O(n)."""
+        keys = self.keys
+        h = 0
+        prev = route[-1]
+        for city in route:
+            h ^= keys[prev][city]
+            prev = city
+        return h
+
+    def tour_hashes(self, routes):
+        """
+        Hasze wielu tras naraz (wiersze tablicy NumPy m x n).
+        
+        Returns:
+            lista m liczb całkowitych - zgodnych z tour_hash / move_hash
+        """
+        if self._key_array is None:
+            self._key_array = np.array(self.keys, dtype=np.uint64)
+        edge_keys = self._key_array[routes, np.roll(routes, -1, axis=1)]
+        return np.bitwise_xor.reduce(edge_keys, axis=1).tolist()
+
+    def move_hash(self, h, removed, added):
+        """
+        Hasz trasy po ruchu - O(1).
+
+        Args:
+            h: hasz trasy przed ruchem
+            removed, added: krawędzie ruchu (jak z MOVE_EDGES)
+        """
+        keys = self.keys
+        for u, v in removed:
+            h ^= keys[u][v]
+        for u, v in added:
+            h ^= keys[u][v]
+        return h